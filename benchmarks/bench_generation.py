@@ -0,0 +1,224 @@
+"""Offline generation benchmarks against the fake OpenAI-compatible server.
+
+Measures, without touching OpenRouter:
+
+- end-to-end streamed generation for 1-4 platforms
+- batch throughput for a generated JSONL file of events
+- TUI render latency, from pressing Generate to the first and last card text
+
+Run from the repository root::
+
+    python benchmarks/bench_generation.py
+    python benchmarks/bench_generation.py --latency 0.5 --tokens-per-second 40 \
+        --error-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_openai import FakeOpenAIServer  # noqa: E402
+
+PLATFORMS = ["linkedin", "facebook", "twitter", "instagram"]
+
+EVENT = {
+    "title": "Python Workshop",
+    "date": "Mar 15, 2026",
+    "time": "7:00 PM",
+    "location": "Central, Hong Kong",
+    "description": "A hands-on introduction to asyncio.",
+}
+
+
+def configure(server: FakeOpenAIServer) -> None:
+    """Point Postman at the fake server with caches, drafts and sinks disabled.
+
+    Drafts would show instantly, so the first text would time the draft
+    rather than the model.
+    """
+    os.environ.update(
+        OPENROUTER_BASE_URL=server.base_url,
+        OPENROUTER_API_KEY="fake",
+        OPENROUTER_MODEL="fake-model",
+        POSTMAN_CACHE="0",
+        POSTMAN_DRAFTS="0",
+        POSTMAN_HISTORY="0",
+        POSTMAN_METRICS_PATH="",
+        POSTMAN_METRICS_PROM="",
+    )
+
+
+async def bench_platforms(runs: int) -> list[dict]:
+    """Time streamed generation for 1 to 4 platforms."""
+    from postman.engine import GenerationEngine
+    from postman.llm import LLMClient
+    from postman.metrics import get_recorder
+
+    client = LLMClient()
+    await client.warm_up()
+    results = []
+    for count in range(1, len(PLATFORMS) + 1):
+        wall, ttft = [], []
+        for _ in range(runs):
+            recorder = get_recorder()
+            recorder.recent.clear()
+            start = time.perf_counter()
+            await GenerationEngine(client).generate_all(
+                EVENT, PLATFORMS[:count], on_chunk=lambda platform, chunk: None
+            )
+            wall.append(time.perf_counter() - start)
+            ttft.extend(
+                m.time_to_first_token
+                for m in recorder.recent
+                if m.time_to_first_token is not None
+            )
+        results.append(
+            {
+                "platforms": count,
+                "wall_s": statistics.median(wall),
+                "ttft_s": statistics.median(ttft) if ttft else None,
+            }
+        )
+    await client.aclose()
+    return results
+
+
+async def bench_batch(events: int, concurrency: int) -> dict:
+    """Measure batch throughput in jobs per second."""
+    from postman.batch import run_batch
+    from postman.llm import LLMClient
+
+    with tempfile.TemporaryDirectory() as tmp:
+        events_path = Path(tmp) / "events.jsonl"
+        events_path.write_text(
+            "".join(
+                json.dumps({**EVENT, "id": f"event-{i}", "title": f"Meetup {i}"})
+                + "\n"
+                for i in range(events)
+            )
+        )
+        client = LLMClient(pool_size=concurrency)
+        start = time.perf_counter()
+        summary = await run_batch(
+            events_path,
+            Path(tmp) / "posts.jsonl",
+            PLATFORMS,
+            concurrency=concurrency,
+            client=client,
+        )
+        elapsed = time.perf_counter() - start
+        await client.aclose()
+    jobs = summary["succeeded"] + summary["failed"]
+    return {
+        "jobs": jobs,
+        "failed": summary["failed"],
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "jobs_per_s": jobs / elapsed,
+    }
+
+
+async def bench_tui() -> dict:
+    """Measure time from pressing Generate to text showing in the cards."""
+    from textual.widgets import Checkbox, Input
+
+    from postman.app import PlatformCard, Postman
+
+    app = Postman()
+    async with app.run_test(size=(160, 60)) as pilot:
+        for platform in PLATFORMS:
+            app.query_one(f"#platform-{platform}", Checkbox).value = True
+        for field in ("title", "date", "time", "location"):
+            app.query_one(f"#{field}", Input).value = EVENT[field]
+        # Let the background warm-up finish so we time steady state
+        for worker in app.workers:
+            await worker.wait()
+        await pilot.pause()
+
+        start = time.perf_counter()
+        app.action_generate()
+        first = last = None
+        while last is None:
+            await asyncio.sleep(0.002)
+            try:
+                cards = list(app.screen.query(PlatformCard))
+            except Exception:
+                continue
+            shown = [card for card in cards if card.content != "Generating..."]
+            if shown and first is None:
+                first = time.perf_counter() - start
+            if cards and not any(worker.is_running for worker in app.workers):
+                last = time.perf_counter() - start
+    return {"first_text_s": first, "all_done_s": last}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    server = await FakeOpenAIServer(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=0,
+    ).start()
+    configure(server)
+    try:
+        return {
+            "server": {
+                "latency_s": args.latency,
+                "tokens_per_second": args.tokens_per_second,
+                "error_rate": args.error_rate,
+            },
+            "platforms": await bench_platforms(args.runs),
+            "batch": await bench_batch(args.events, args.concurrency),
+            "tui": await bench_tui(),
+        }
+    finally:
+        await server.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--events", type=int, default=10, help="Batch events")
+    parser.add_argument("--concurrency", type=int, default=8, help="Batch workers")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results))
+        return 0
+
+    print("End-to-end streamed generation (median)")
+    for row in results["platforms"]:
+        ttft = row["ttft_s"]
+        print(
+            f"  {row['platforms']} platform(s): {row['wall_s'] * 1000:8.1f} ms"
+            f"   TTFT {'-' if ttft is None else f'{ttft * 1000:.1f} ms'}"
+        )
+    batch = results["batch"]
+    print(
+        f"Batch: {batch['jobs']} jobs ({batch['failed']} failed) at "
+        f"concurrency {batch['concurrency']}: {batch['jobs_per_s']:.1f} jobs/s"
+    )
+    tui = results["tui"]
+    print(
+        f"TUI: first text {tui['first_text_s'] * 1000:.1f} ms, "
+        f"all cards {tui['all_done_s'] * 1000:.1f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
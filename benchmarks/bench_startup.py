@@ -0,0 +1,117 @@
+"""Startup-time benchmark for the Postman TUI.
+
+Measures, in fresh interpreter processes:
+
+- the time to ``import postman.app``
+- the time from interpreter start to the first painted frame
+- whether the LLM stack (langchain, openai, tenacity) leaked into startup
+
+Run from the repository root::
+
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --max-first-paint-ms 1500  # fail on regression
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+LLM_MODULES = ("langchain_core", "langchain_openai", "openai", "tenacity")
+
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+from postman.app import Postman
+imported = time.perf_counter()
+
+
+class StartupProbe(Postman):
+    def on_mount(self):
+        super().on_mount()
+        self.call_after_refresh(self._painted)
+
+    def _painted(self):
+        self.painted = time.perf_counter()
+        self.exit()
+
+
+app = StartupProbe()
+app.run(headless=True)
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_paint_ms": (app.painted - start) * 1000,
+}))
+"""
+
+IMPORT_PROBE = r"""
+import json, sys
+import postman.app
+print(json.dumps(sorted(m for m in {modules!r} if m in sys.modules)))
+"""
+
+
+def run_probe(code: str) -> str:
+    """Run ``code`` in a fresh interpreter with ``src`` on the path."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument(
+        "--max-first-paint-ms",
+        type=float,
+        help="Exit non-zero if the median time to first paint exceeds this",
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    leaked = json.loads(run_probe(IMPORT_PROBE.format(modules=LLM_MODULES)))
+    samples = [json.loads(run_probe(PROBE)) for _ in range(args.runs)]
+    import_ms = statistics.median(s["import_ms"] for s in samples)
+    first_paint_ms = statistics.median(s["first_paint_ms"] for s in samples)
+    results = {
+        "runs": args.runs,
+        "import_ms": round(import_ms, 1),
+        "first_paint_ms": round(first_paint_ms, 1),
+        "llm_modules_at_import": leaked,
+    }
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"runs:             {args.runs}")
+        print(f"import postman:   {import_ms:8.1f} ms (median)")
+        print(f"first paint:      {first_paint_ms:8.1f} ms (median)")
+        print(f"LLM stack loaded: {', '.join(leaked) or 'no'}")
+
+    failed = False
+    if leaked:
+        print(f"FAIL: startup imports {', '.join(leaked)}", file=sys.stderr)
+        failed = True
+    if args.max_first_paint_ms and first_paint_ms > args.max_first_paint_ms:
+        print(
+            f"FAIL: first paint {first_paint_ms:.1f} ms exceeds "
+            f"{args.max_first_paint_ms:.1f} ms",
+            file=sys.stderr,
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
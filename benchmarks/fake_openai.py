@@ -0,0 +1,243 @@
+"""Local stand-in for an OpenAI-compatible chat-completions server.
+
+Speaks just enough HTTP/1.1 (keep-alive, chunked server-sent events) for the
+OpenAI SDK and ``LLMClient`` to talk to it, with configurable latency, token
+rate and error injection. Point Postman at it with::
+
+    python benchmarks/fake_openai.py --port 8765 --latency 0.3 --tokens-per-second 80
+    OPENROUTER_BASE_URL=http://127.0.0.1:8765/v1 OPENROUTER_API_KEY=fake postman
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+
+POST_TEMPLATE = (
+    "Join us for an evening of Python talks and networking with the Hong Kong "
+    "Python User Group. Whether you are just starting out or ship Python every "
+    "day, there is something here for you.\n\n"
+    "• Date: March 15, 2026\n"
+    "• Time: 7:00 PM\n"
+    "• Location: Central, Hong Kong\n\n"
+    "#Python #HKPUG #TechCommunity"
+)
+
+REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Error"}
+
+
+class FakeOpenAIServer:
+    """Fake chat-completions server for benchmarks.
+
+    ``latency`` is the delay before the first token, ``tokens_per_second``
+    the streaming rate, and ``error_rate`` the fraction of completion
+    requests answered with ``error_status`` instead.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.2,
+        tokens_per_second: float = 100.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        response: str = POST_TEMPLATE,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response = response
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> "FakeOpenAIServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0"))
+                body = await reader.readexactly(length) if length else b""
+                await self._route(method, path, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(
+        self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        if path.endswith("/models"):
+            self._send_json(writer, 200, {"object": "list", "data": []}, method)
+        elif path.endswith("/chat/completions") and method == "POST":
+            await self._complete(json.loads(body or b"{}"), writer)
+        else:
+            self._send_json(writer, 404, {"error": {"message": "not found"}}, method)
+        await writer.drain()
+
+    async def _complete(self, payload: dict, writer: asyncio.StreamWriter) -> None:
+        self.requests += 1
+        model = payload.get("model", "fake")
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            await asyncio.sleep(self.latency)
+            self._send_json(
+                writer,
+                self.error_status,
+                {"error": {"message": "injected failure", "code": self.error_status}},
+                extra_headers={"Retry-After": "0"},
+            )
+            return
+
+        prompt_tokens = sum(
+            len(str(message.get("content", ""))) // 4
+            for message in payload.get("messages", [])
+        )
+        tokens = self.response.split(" ")
+        tokens = [token + " " for token in tokens[:-1]] + tokens[-1:]
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        created = int(time.time())
+        await asyncio.sleep(self.latency)
+
+        if not payload.get("stream"):
+            await asyncio.sleep(len(tokens) / self.tokens_per_second)
+            choice = {
+                "index": 0,
+                "message": {"role": "assistant", "content": self.response},
+                "finish_reason": "stop",
+            }
+            self._send_json(
+                writer,
+                200,
+                {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [choice] * int(payload.get("n", 1) or 1),
+                    "usage": usage,
+                },
+            )
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+
+        def event(choices: list, **extra) -> None:
+            data = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            self._send_chunk(writer, f"data: {json.dumps(data)}\n\n".encode())
+
+        event([{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}])
+        for token in tokens:
+            event([{"index": 0, "delta": {"content": token}, "finish_reason": None}])
+            await writer.drain()
+            await asyncio.sleep(1 / self.tokens_per_second)
+        event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            event([], usage=usage)
+        self._send_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def _send_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    @staticmethod
+    def _send_json(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict,
+        method: str = "POST",
+        extra_headers: Optional[dict] = None,
+    ) -> None:
+        body = json.dumps(payload).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            **(extra_headers or {}),
+        }
+        head = f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        )
+        writer.write(head.encode() + b"\r\n" + (b"" if method == "HEAD" else body))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds to TTFT")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    print(f"Fake OpenAI server on {server.base_url}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 """Postman TUI application."""
 
+import asyncio
+import importlib
+import time
+
 import pyperclip
+from textual import constants
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical, VerticalScroll, VerticalGroup, Grid
 from textual.screen import Screen
@@ -14,37 +19,23 @@ from textual.widgets import (
     Static,
     TextArea,
 )
+from textual.timer import Timer
+from textual.worker import Worker
 
-from typing import Dict
-
-try:
-    from postman.llm import LLMClient, LLMError
-    from postman.prompts import Platform, PromptManager
-
-    _HAVE_LLM = True
-except ImportError:
-    _HAVE_LLM = False
+from typing import Dict, Mapping, Optional
 
-    class LLMClient:
-        pass
+from rich.table import Table
 
-    class LLMError(Exception):
-        pass
+from postman.backends import create_backend, draft_post
+from postman.config import config
+from postman.metrics import GenerationMetrics, get_recorder
+from postman.profiling import watch_loop
+from postman.prompts import EVENT_FIELDS, Platform
+from postman.history import HistoryEntry, PostHistory
+from postman.results import HistoryScreen, ResultsScreen
 
-    class Platform:
-        LINKEDIN = "linkedin"
-        FACEBOOK = "facebook"
-        TWITTER = "twitter"
-        INSTAGRAM = "instagram"
-
-    class PromptManager:
-        @staticmethod
-        def get_prompt(p):
-            return ""
-
-        @staticmethod
-        def build_event_context(**kwargs):
-            return ""
+# Number of recent generations shown in the stats panel
+STATS_ROWS = 12
 
 
 class PlatformCard(Vertical):
@@ -56,11 +47,20 @@ class PlatformCard(Vertical):
         self.content = "Generating..."
 
     def compose(self) -> ComposeResult:
-        yield Label(self.platform.title(), classes="platform-title")
+        yield Label(
+            self.platform.title(),
+            id=f"title-{self.platform}",
+            classes="platform-title",
+        )
         yield Static(
             self.content, id=f"content-{self.platform}", classes="platform-content"
         )
-        yield Button("Copy", id=f"copy-{self.platform}", variant="success")
+        yield Static(id=f"fields-{self.platform}", classes="field-status")
+        with Horizontal(classes="card-buttons"):
+            yield Button("Copy", id=f"copy-{self.platform}", variant="success")
+            yield Button("Regenerate", id=f"regen-{self.platform}")
+            yield Button("◀", id=f"prev-{self.platform}", classes="candidate-nav")
+            yield Button("▶", id=f"next-{self.platform}", classes="candidate-nav")
 
     def update_content(self, content: str) -> None:
         """Update the content display."""
@@ -71,22 +71,70 @@ class PlatformCard(Vertical):
         except Exception:
             pass
 
+    def update_title(
+        self,
+        index: int,
+        total: int,
+        draft: bool = False,
+        source: Optional[str] = None,
+    ) -> None:
+        """Show which of several candidate posts, or a draft, is displayed.
+
+        ``source`` says how a past post was used, such as ``"reused"``.
+        """
+        try:
+            title = self.platform.title()
+            if total > 1:
+                title = f"{title} ({index + 1}/{total})"
+            if draft:
+                title = f"{title} · draft"
+            elif source:
+                title = f"{title} · {source} from history"
+            self.query_one(f"#title-{self.platform}", Label).update(title)
+            for button in self.query(".candidate-nav"):
+                button.display = total > 1
+        except Exception:
+            pass
+
+
+    def update_fields(self, fields: Mapping[str, list[str]]) -> None:
+        """Show which sections of a structured post are done, and their problems."""
+        try:
+            status = self.query_one(f"#fields-{self.platform}", Static)
+            marks = "  ".join(
+                f"{'✗' if problems else '✓'} {field.title()}"
+                for field, problems in fields.items()
+            )
+            problems = [problem for found in fields.values() for problem in found]
+            status.update("\n".join([marks, *problems]))
+            status.display = bool(fields)
+        except Exception:
+            pass
+
 
 class PreviewScreen(Screen[None]):
     """Preview screen showing grid of platform posts."""
 
-    BINDINGS = [("escape", "dismiss", "Back"), ("b", "dismiss", "Back")]
+    BINDINGS = [
+        ("escape", "dismiss", "Back"),
+        ("b", "dismiss", "Back"),
+        ("r", "app.regenerate", "Regenerate"),
+        ("s", "toggle_stats", "Stats"),
+    ]
 
     def __init__(self, platforms: list[str], **kwargs):
         super().__init__(**kwargs)
         self.platforms = platforms
 
     def action_dismiss(self) -> None:
+        # Leaving the preview abandons its generations
+        self.app.cancel_generation()
         self.dismiss()
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         with VerticalScroll(classes="scroll-view"):
+            yield Static(id="stats-panel", classes="stats-panel")
             # Create grid layout for platform cards
             for i in range(0, len(self.platforms), 2):
                 with Horizontal(classes="platform-row"):
@@ -100,10 +148,12 @@ class PreviewScreen(Screen[None]):
                         yield PlatformCard(platform2, id=f"card-{platform2}")
         with Horizontal(classes="button-container"):
             yield Button("Back", id="back", variant="primary")
+            yield Button("Regenerate", id="regenerate", variant="warning")
         yield Footer()
 
     def on_mount(self) -> None:
         """Update cards with current outputs from app."""
+        get_recorder().subscribe(self._on_metrics)
         app = self.app
         if hasattr(app, "platform_outputs"):
             for platform in self.platforms:
@@ -111,16 +161,80 @@ class PreviewScreen(Screen[None]):
                 try:
                     card = self.query_one(f"#card-{platform}", PlatformCard)
                     card.update_content(content)
+                    card.update_title(
+                        app.candidate_index.get(platform, 0),
+                        len(app.platform_candidates.get(platform, [])),
+                        platform in app.drafts,
+                        app.platform_sources.get(platform),
+                    )
+                    card.update_fields(app.platform_fields.get(platform, {}))
                 except Exception:
                     pass
 
+    def on_unmount(self) -> None:
+        get_recorder().unsubscribe(self._on_metrics)
+
+    def action_toggle_stats(self) -> None:
+        """Show or hide the generation stats panel."""
+        panel = self.query_one("#stats-panel", Static)
+        panel.display = not panel.display
+        if panel.display:
+            panel.update(self._render_stats())
+
+    def _on_metrics(self, metrics: GenerationMetrics) -> None:
+        panel = self.query_one("#stats-panel", Static)
+        if panel.display:
+            panel.update(self._render_stats())
+
+    def _render_stats(self) -> Table:
+        """Render the most recent generation metrics as a table."""
+        table = Table(title="Recent generations", expand=True)
+        for column in ("Platform", "Model", "Queue", "TTFT", "Total"):
+            table.add_column(column)
+        for column in ("Tokens in/out", "Tok/s", "Retries", "Status"):
+            table.add_column(column)
+
+        def seconds(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value:.2f}s"
+
+        for metrics in list(get_recorder().recent)[-STATS_ROWS:]:
+            rate = metrics.tokens_per_second
+            status = metrics.status
+            if metrics.cached:
+                status = "cached"
+            elif metrics.shared and status == "ok":
+                status = "shared"
+            table.add_row(
+                metrics.label,
+                metrics.model,
+                seconds(metrics.queue_time),
+                seconds(metrics.time_to_first_token),
+                seconds(metrics.latency),
+                f"{metrics.tokens_in}/{metrics.tokens_out}",
+                "-" if rate is None else f"{rate:.1f}",
+                str(metrics.retries),
+                status,
+            )
+        return table
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "back":
-            self.dismiss()
+            self.action_dismiss()
+        elif event.button.id == "regenerate":
+            self.app.action_regenerate()
         elif event.button.id and event.button.id.startswith("copy-"):
             # Extract platform from button id (copy-{platform})
             platform = event.button.id.replace("copy-", "")
             self.app.action_copy(platform)
+        elif event.button.id and event.button.id.startswith("regen-"):
+            platform = event.button.id.replace("regen-", "")
+            self.app.regenerate_platform(platform)
+        elif event.button.id and event.button.id.startswith("prev-"):
+            platform = event.button.id.replace("prev-", "")
+            self.app.show_candidate(platform, -1)
+        elif event.button.id and event.button.id.startswith("next-"):
+            platform = event.button.id.replace("next-", "")
+            self.app.show_candidate(platform, 1)
 
 
 class Postman(App):
@@ -201,18 +315,70 @@ class Postman(App):
     PlatformCard {
         width: 50%;
     }
+
+    .card-buttons {
+        height: auto;
+    }
+
+    .field-status {
+        height: auto;
+        margin-bottom: 1;
+        color: $text-muted;
+        display: none;
+    }
+
+    .candidate-nav {
+        min-width: 5;
+        display: none;
+    }
+
+    .stats-panel {
+        height: auto;
+        margin-bottom: 1;
+        display: none;
+    }
     """
 
     BINDINGS = [
         ("q", "quit", "Exit"),
         ("g", "generate", "Generate"),
+        ("l", "show_results", "Results"),
+        ("h", "show_history", "History"),
     ]
 
     def __init__(self):
         super().__init__()
         self.llm_client = None
         self.platform_outputs: Dict[str, str] = {}
+        # Ranked alternative posts per platform, and which one is shown
+        self.platform_candidates: Dict[str, list[str]] = {}
+        self.candidate_index: Dict[str, int] = {}
+        # Format problems of each completed field of a streaming structured
+        # post, per platform
+        self.platform_fields: Dict[str, Dict[str, list[str]]] = {}
+        # Platforms whose post reuses or adapts a similar past event's post
+        self.platform_sources: Dict[str, str] = {}
+        # Platforms showing a template draft until the LLM's post arrives
+        self.drafts: set[str] = set()
+        # Every post generated this session, as batch-style result records
+        self.results: list[dict] = []
+        self._history: Optional[PostHistory] = None
         self.form_state = {}
+        # Platforms whose output changed since the last frame
+        self._dirty_platforms: set[str] = set()
+        self._refresh_timer = None
+        self._active_generations = 0
+        self._engine = None
+        # In-flight worker and latest run id for each platform; results from
+        # any older run are stale and dropped
+        self._platform_workers: Dict[str, Worker] = {}
+        self._platform_runs: Dict[str, int] = {}
+        self._run_counter = 0
+        # Event inputs each in-flight run was started from
+        self._platform_inputs: Dict[str, tuple] = {}
+        # Event inputs each platform's current output was generated from
+        self._generated_from: Dict[str, tuple] = {}
+        self._speculation_timer: Optional[Timer] = None
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -317,17 +483,144 @@ Social Media Post Agent in .py
         except:
             pass
 
+    def _event_inputs(self, fields: Optional[dict] = None) -> tuple:
+        """Get the form fields a platform's generation request depends on."""
+        fields = self.form_state if fields is None else fields
+        return tuple(fields.get(field, "") for field in EVENT_FIELDS)
+
+    def _is_up_to_date(self, platform: str, inputs: tuple) -> bool:
+        """Check if a platform's output was, or is being, generated from ``inputs``."""
+        if (
+            self._generated_from.get(platform) == inputs
+            and platform in self.platform_outputs
+        ):
+            return True
+        worker = self._platform_workers.get(platform)
+        return (
+            worker is not None
+            and not worker.is_finished
+            and self._platform_inputs.get(platform) == inputs
+        )
+
     def action_generate(self) -> None:
         self.save_form_state()
         platforms = self.form_state.get("platforms", ["linkedin"])
-        # Initialize outputs with "Generating..." for each platform
-        self.platform_outputs = {platform: "Generating..." for platform in platforms}
+        # Keep outputs whose inputs are unchanged, including speculative runs
+        # still streaming; only new or changed platforms go back to the LLM
+        inputs = self._event_inputs()
+        # Deselected platforms lose their output, so they start over if
+        # they are selected again
+        known = {*self.platform_outputs, *self._generated_from, *self._platform_workers}
+        self.cancel_generation([p for p in known if p not in platforms])
+        stale = [p for p in platforms if not self._is_up_to_date(p, inputs)]
+        self.platform_outputs = {
+            platform: (
+                "Generating..."
+                if platform in stale
+                else self.platform_outputs.get(platform, "Generating...")
+            )
+            for platform in platforms
+        }
         self.push_screen(PreviewScreen(platforms))
-        self.run_worker(self._run_generation(platforms))
+        if stale:
+            self._start_generation(stale)
 
-    async def _run_generation(self, platforms: list[str]) -> None:
-        """Run LLM generation sequentially for each selected platform."""
-        if not _HAVE_LLM:
+    def action_regenerate(self) -> None:
+        """Regenerate the current preview, bypassing the response cache."""
+        platforms = self.form_state.get("platforms", ["linkedin"])
+        self._start_regeneration(platforms)
+
+    def regenerate_platform(self, platform: str) -> None:
+        """Regenerate a single card, bypassing the response cache."""
+        self._start_regeneration([platform])
+
+    def _start_regeneration(self, platforms: list[str]) -> None:
+        self._start_generation(platforms, use_cache=False)
+
+    def _start_generation(self, platforms: list[str], use_cache: bool = True) -> None:
+        """Start generating platforms, superseding any run already in flight.
+
+        Each platform gets its own worker so one card can be restarted
+        without disturbing the others; in multi-platform mode they share one
+        worker because they share one request.
+        """
+        self.cancel_generation(platforms)
+        fields = dict(self.form_state)
+        inputs = self._event_inputs(fields)
+        for platform in platforms:
+            self.platform_outputs[platform] = self._placeholder(fields, platform)
+            self._update_platform_card(platform)
+        if config.multi_platform and len(platforms) > 1:
+            batches = [platforms]
+        else:
+            batches = [[platform] for platform in platforms]
+        for batch in batches:
+            self._run_counter += 1
+            run_id = self._run_counter
+            for platform in batch:
+                self._platform_runs[platform] = run_id
+                self._platform_inputs[platform] = inputs
+                self.platform_candidates.pop(platform, None)
+                self.candidate_index.pop(platform, None)
+                self.platform_fields.pop(platform, None)
+                self.platform_sources.pop(platform, None)
+            worker = self.run_worker(
+                self._run_generation(batch, run_id, fields, use_cache),
+                group="generation",
+            )
+            for platform in batch:
+                self._platform_workers[platform] = worker
+
+    def cancel_generation(self, platforms: Optional[list[str]] = None) -> None:
+        """Cancel in-flight generations, for all platforms by default.
+
+        Cancelling a worker aborts its HTTP streams. A worker still serving a
+        platform that is not being cancelled keeps running, but its results
+        for the cancelled platforms are dropped as stale.
+        """
+        if platforms is None:
+            platforms = list(self._platform_workers)
+        cancelled = set(platforms)
+        for platform in platforms:
+            self._platform_runs.pop(platform, None)
+            self._platform_inputs.pop(platform, None)
+            worker = self._platform_workers.pop(platform, None)
+            if worker is None:
+                continue
+            if not any(w is worker for w in self._platform_workers.values()):
+                worker.cancel()
+        # Forget outputs that were cut short so they are generated again
+        for platform in cancelled:
+            self._generated_from.pop(platform, None)
+        self.drafts -= cancelled
+
+    def _placeholder(self, fields: dict, platform: str) -> str:
+        """Get what a card shows until its post arrives.
+
+        With instant drafts on, that is a template draft built locally from
+        the form, so there is something usable to read or copy right away.
+        """
+        if not config.instant_drafts:
+            return "Generating..."
+        self.drafts.add(platform)
+        return draft_post(fields, Platform(platform))
+
+    def _is_current_run(self, platform: str, run_id: int) -> bool:
+        return self._platform_runs.get(platform) == run_id
+
+    async def _run_generation(
+        self,
+        platforms: list[str],
+        run_id: int,
+        fields: dict,
+        use_cache: bool = True,
+    ) -> None:
+        """Run LLM generation concurrently for the given platforms."""
+        # The LLM stack is imported on first use so it never delays startup
+        try:
+            from postman.engine import GenerationEngine
+            from postman.llm import get_shared_client
+        except ImportError:
             for platform in platforms:
                 self.platform_outputs[platform] = (
                     "LLM not available. Install postman dependencies and set OPENROUTER_API_KEY."
@@ -335,42 +628,225 @@ Social Media Post Agent in .py
                 self._update_platform_card(platform)
             return
 
-        fs = self.form_state
-
         # Initialize LLM client once
         if self.llm_client is None:
             try:
-                self.llm_client = LLMClient()
+                self.llm_client = get_shared_client()
             except Exception as e:
-                for platform in platforms:
-                    self.platform_outputs[platform] = (
-                        f"Configuration error: {e}. Set OPENROUTER_API_KEY in .env to generate."
-                    )
-                    self._update_platform_card(platform)
+                # Template drafts need no API key, so there is still a post
+                self.llm_client = create_backend("template")
+                self.notify(
+                    f"Configuration error: {e}. Showing template drafts; "
+                    "set OPENROUTER_API_KEY in .env to generate with the LLM.",
+                    severity="warning",
+                )
+
+        inputs = self._event_inputs(fields)
+        streaming: set[str] = set()
+        for platform in platforms:
+            self._generated_from.pop(platform, None)
+
+        def on_chunk(platform: str, chunk: str) -> None:
+            if not self._is_current_run(platform, run_id):
+                return
+            # Replace the placeholder on the first chunk, then append
+            if platform not in streaming:
+                streaming.add(platform)
+                self.drafts.discard(platform)
+                self.platform_outputs[platform] = ""
+            self.platform_outputs[platform] += chunk
+            self._dirty_platforms.add(platform)
+
+        def on_field(platform: str, field: str, problems: list[str]) -> None:
+            if not self._is_current_run(platform, run_id):
                 return
+            self.platform_fields.setdefault(platform, {})[field] = problems
+            self._dirty_platforms.add(platform)
 
-        # Generate for each platform sequentially
-        for platform_name in platforms:
-            try:
-                platform = Platform(platform_name)
-                system_prompt = PromptManager.get_prompt(platform)
-                user_input = PromptManager.build_event_context(
-                    title=fs.get("title", ""),
-                    date=fs.get("date", ""),
-                    time=fs.get("time", ""),
-                    location=fs.get("location", ""),
-                    description=fs.get("description", ""),
-                    platform=platform,
+        def on_source(platform: str, source: str) -> None:
+            if not self._is_current_run(platform, run_id):
+                return
+            self.platform_sources[platform] = source
+            self._dirty_platforms.add(platform)
+
+        def on_candidates(platform: str, candidates: list[str]) -> None:
+            if not self._is_current_run(platform, run_id):
+                return
+            self.platform_candidates[platform] = candidates
+            self.candidate_index[platform] = 0
+
+        def on_result(platform: str, result: str, succeeded: bool) -> None:
+            if not self._is_current_run(platform, run_id):
+                return
+            self._platform_runs.pop(platform, None)
+            self._platform_workers.pop(platform, None)
+            self._platform_inputs.pop(platform, None)
+            if not succeeded and platform in self.drafts:
+                # A usable draft beats an error message
+                self.notify(
+                    f"{platform.title()}: {result}. Keeping the template draft.",
+                    severity="warning",
                 )
-                result = await self.llm_client.generate(system_prompt, user_input)
-                self.platform_outputs[platform_name] = result
-            except LLMError as e:
-                self.platform_outputs[platform_name] = f"Generation failed: {e}"
-            except Exception as e:
-                self.platform_outputs[platform_name] = f"Error: {e}"
+            else:
+                self.platform_outputs[platform] = result
+            # The finished post has been checked and fixed as a whole
+            self.platform_fields.pop(platform, None)
+            self.drafts.discard(platform)
+            self._dirty_platforms.add(platform)
+            self._record_result(platform, run_id, fields, result, succeeded)
+            if succeeded:
+                self._generated_from[platform] = inputs
+
+        # One engine for the session so the concurrency limit spans all runs
+        if self._engine is None:
+            self._engine = GenerationEngine(self.llm_client, history=self.history)
+        engine = self._engine
+        self._active_generations += 1
+        self._refresh_timer.resume()
+        try:
+            await engine.generate_all(
+                fields,
+                platforms,
+                on_result,
+                on_chunk=on_chunk,
+                use_cache=use_cache,
+                on_candidates=on_candidates,
+                on_field=on_field,
+                on_source=on_source,
+            )
+        finally:
+            self._flush_platform_cards()
+            self._active_generations -= 1
+            if not self._active_generations:
+                self._refresh_timer.pause()
+
+    def _record_result(
+        self, platform: str, run_id: int, fields: dict, result: str, succeeded: bool
+    ) -> None:
+        """Add a finished generation, and each of its candidates, to the results."""
+        candidates = self.platform_candidates.get(platform, []) if succeeded else []
+        record = {
+            "id": str(run_id),
+            "platform": platform,
+            "title": fields.get("title", ""),
+            "output": result if succeeded else "",
+            "error": None if succeeded else result,
+            "finished_at": time.time(),
+        }
+        if len(candidates) <= 1:
+            self.results.append(record)
+            return
+        for number, candidate in enumerate(candidates, start=1):
+            self.results.append({**record, "output": candidate, "candidate": number})
+
+    def action_show_results(self) -> None:
+        """Browse every post generated this session."""
+        if not isinstance(self.screen, ResultsScreen):
+            self.push_screen(ResultsScreen(self.results))
+
+    @property
+    def history(self) -> Optional[PostHistory]:
+        """Get the post history, opening it on first use, or None if disabled."""
+        if self._history is None and config.history_enabled:
+            self._history = PostHistory.from_config()
+        return self._history
+
+    def action_show_history(self) -> None:
+        """Search past posts and pick one to reuse."""
+        if isinstance(self.screen, ResultsScreen):
+            return
+        if self.history is None:
+            self.notify(
+                "History is disabled; set POSTMAN_HISTORY=1", severity="warning"
+            )
+            return
+        self.push_screen(HistoryScreen(self.history), self.reuse_post)
 
-            # Update UI after each platform completes
-            self._update_platform_card(platform_name)
+    def reuse_post(self, entry: Optional[HistoryEntry]) -> None:
+        """Open a past post as the current one, without calling the LLM.
+
+        The form is filled in with the post's event so it can be edited;
+        the post is only regenerated once its event details change.
+        """
+        if entry is None:
+            return
+        if isinstance(self.screen, PreviewScreen):
+            self.pop_screen()
+        self.cancel_generation()
+        form = self.screen_stack[0]
+        try:
+            for field in ("title", "date", "time", "location"):
+                form.query_one(f"#{field}", Input).value = entry.fields.get(field, "")
+            form.query_one("#description", TextArea).text = entry.fields.get(
+                "description", ""
+            )
+            for platform in Platform:
+                form.query_one(f"#platform-{platform.value}", Checkbox).value = (
+                    platform.value == entry.platform
+                )
+        except Exception:
+            pass
+        self.form_state = {**entry.fields, "platforms": [entry.platform]}
+        self.platform_outputs = {entry.platform: entry.output}
+        self.platform_candidates.pop(entry.platform, None)
+        self.candidate_index.pop(entry.platform, None)
+        self.platform_fields.pop(entry.platform, None)
+        self.platform_sources.pop(entry.platform, None)
+        self._generated_from[entry.platform] = self._event_inputs()
+        self.push_screen(PreviewScreen([entry.platform]))
+
+    def _schedule_speculation(self) -> None:
+        """Restart the idle timer for speculative generation after a form edit."""
+        if not config.speculative or isinstance(self.screen, PreviewScreen):
+            return
+        self.save_form_state()
+        inputs = self._event_inputs()
+        platforms = self.form_state.get("platforms", [])
+        # Runs started from earlier inputs can no longer be used
+        outdated = [
+            platform
+            for platform, run_inputs in self._platform_inputs.items()
+            if run_inputs != inputs or platform not in platforms
+        ]
+        if outdated:
+            self.cancel_generation(outdated)
+        if self._speculation_timer is not None:
+            self._speculation_timer.stop()
+        self._speculation_timer = self.set_timer(
+            config.speculative_delay, self._speculate
+        )
+
+    def _speculate(self) -> None:
+        """Start generating in the background once the form is complete."""
+        self._speculation_timer = None
+        if isinstance(self.screen, PreviewScreen):
+            return
+        self.save_form_state()
+        if not all(self.form_state.get(field, "").strip() for field in EVENT_FIELDS):
+            return
+        inputs = self._event_inputs()
+        stale = [
+            platform
+            for platform in self.form_state.get("platforms", [])
+            if not self._is_up_to_date(platform, inputs)
+        ]
+        if stale:
+            self._start_generation(stale)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self._schedule_speculation()
+
+    def on_text_area_changed(self, event: TextArea.Changed) -> None:
+        self._schedule_speculation()
+
+    def on_checkbox_changed(self, event: Checkbox.Changed) -> None:
+        self._schedule_speculation()
+
+    def _flush_platform_cards(self) -> None:
+        """Push buffered output to the platform cards, at most once per frame."""
+        dirty, self._dirty_platforms = self._dirty_platforms, set()
+        for platform in dirty:
+            self._update_platform_card(platform)
 
     def _update_platform_card(self, platform: str) -> None:
         """Update the platform card display."""
@@ -380,9 +856,26 @@ Social Media Post Agent in .py
                 card = screen.query_one(f"#card-{platform}", PlatformCard)
                 content = self.platform_outputs.get(platform, "")
                 card.update_content(content)
+                card.update_title(
+                    self.candidate_index.get(platform, 0),
+                    len(self.platform_candidates.get(platform, [])),
+                    platform in self.drafts,
+                    self.platform_sources.get(platform),
+                )
+                card.update_fields(self.platform_fields.get(platform, {}))
             except Exception:
                 pass
 
+    def show_candidate(self, platform: str, step: int) -> None:
+        """Show the next or previous candidate post on a platform's card."""
+        candidates = self.platform_candidates.get(platform)
+        if not candidates:
+            return
+        index = (self.candidate_index.get(platform, 0) + step) % len(candidates)
+        self.candidate_index[platform] = index
+        self.platform_outputs[platform] = candidates[index]
+        self._update_platform_card(platform)
+
     def action_copy(self, platform: str = None) -> None:
         """Copy output to clipboard. If platform is specified, copy that platform's content."""
         if platform:
@@ -408,8 +901,37 @@ Social Media Post Agent in .py
             self.notify(f"Failed to copy: {e}", severity="error")
 
     def on_mount(self):
+        # Streamed chunks are coalesced and rendered at the display frame rate
+        self._refresh_timer = self.set_interval(
+            1 / constants.MAX_FPS, self._flush_platform_cards, pause=True
+        )
+        self.run_worker(self._warm_up_llm(), group="warm-up")
+        watch_loop()
         self.notify("Postman Ready")
 
+    async def _warm_up_llm(self) -> None:
+        """Load the LLM stack and open pooled connections after the first frame."""
+        try:
+            # Import off the event loop so the UI stays responsive
+            await asyncio.to_thread(importlib.import_module, "postman.engine")
+            from postman.llm import get_shared_client
+
+            client = get_shared_client()
+        except Exception:
+            # Missing dependencies or API key are reported when the user generates
+            return
+        if self.llm_client is None:
+            self.llm_client = client
+        await client.warm_up()
+
+    async def on_unmount(self) -> None:
+        if self._history is not None:
+            self._history.close()
+        if self.llm_client is not None:
+            from postman.llm import close_shared_client
+
+            await close_shared_client()
+
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "generate":
             self.action_generate()
@@ -418,7 +940,7 @@ Social Media Post Agent in .py
 
 
 def main():
-    """Main entry point for the postman CLI."""
+    """Run the Postman TUI."""
     Postman().run()
 
 
@@ -0,0 +1,257 @@
+"""Pluggable generation backends and the registry that selects them."""
+
+import json
+import re
+from typing import AsyncIterator, Callable, Dict, Mapping, Optional, Protocol
+
+from postman.config import config
+from postman.metrics import GenerationMetrics, MetricsRecorder, get_recorder
+from postman.prompts import Platform, PromptManager
+from postman.validation import DEFAULT_HASHTAGS
+
+
+class GenerationBackend(Protocol):
+    """What the generation engine needs from a backend."""
+
+    model: str
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> str: ...
+
+    def generate_stream(
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+        stop: Optional[str] = None,
+    ) -> AsyncIterator[str]: ...
+
+    async def generate_candidates(
+        self,
+        system_prompt: str,
+        user_input: str,
+        count: int,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> list[str]: ...
+
+    async def warm_up(self) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+BackendFactory = Callable[..., GenerationBackend]
+
+_BACKENDS: Dict[str, BackendFactory] = {}
+
+
+def register_backend(name: str) -> Callable[[BackendFactory], BackendFactory]:
+    """Register a backend factory under ``name`` for ``POSTMAN_BACKEND``.
+
+    Factories accept an optional ``pool_size`` keyword argument.
+    """
+
+    def decorator(factory: BackendFactory) -> BackendFactory:
+        _BACKENDS[name] = factory
+        return factory
+
+    return decorator
+
+
+def available_backends() -> list[str]:
+    """Get the names of the registered backends."""
+    return sorted(_BACKENDS)
+
+
+def create_backend(
+    name: Optional[str] = None, pool_size: Optional[int] = None
+) -> GenerationBackend:
+    """Create the named backend, or the configured one."""
+    name = name or config.backend
+    factory = _BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(
+            f"Unknown backend {name!r}; choose from {', '.join(available_backends())}"
+        )
+    return factory(pool_size=pool_size)
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _shorten(text: str, limit: int) -> str:
+    """Cut text to at most ``limit`` characters, at a sentence if possible."""
+    if len(text) <= limit:
+        return text
+    kept = ""
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{kept} {sentence}".strip()
+        if len(candidate) > limit:
+            break
+        kept = candidate
+    if kept:
+        return kept
+    return text[: max(0, limit - 1)].rstrip() + "…"
+
+
+def draft_post(fields: Mapping[str, str], platform: Platform) -> str:
+    """Build a post from the event fields alone, following the format rules.
+
+    Deterministic and instant; used as a draft while the LLM writes the
+    real post, and by the template backend.
+    """
+    rules = PromptManager.get_format_rules(platform)
+    title = fields.get("title", "").strip() or "our next event"
+    description = " ".join(fields.get("description", "").split())
+    date, time, location = (
+        fields.get(field, "").strip() or "TBA" for field in ("date", "time", "location")
+    )
+    tag_count = min(rules.max_hashtags, max(rules.min_hashtags, 3))
+    tags = " ".join(DEFAULT_HASHTAGS[:tag_count])
+
+    hook = f"Join us for {title}!"
+    if platform is Platform.INSTAGRAM:
+        hook = f"🐍 {hook}"
+    if rules.compact_details:
+        details = f"• {date} | {time} | {location}"
+    else:
+        details = f"• Date: {date}\n• Time: {time}\n• Location: {location}"
+    closing = ""
+    if platform is Platform.INSTAGRAM:
+        closing = "\n\nWho's coming? Drop a 🙋 below!"
+
+    def assemble(intro: str) -> str:
+        return f"{intro}\n\n{details}{closing}\n\n{tags}"
+
+    if rules.compact_details:
+        # Ultra-compact platforms get the hook only
+        intro = hook
+    else:
+        intro = f"{hook} {description}".strip()
+    if rules.max_chars is not None and len(assemble(intro)) > rules.max_chars:
+        budget = rules.max_chars - len(assemble(""))
+        intro = _shorten(intro, budget)
+    return assemble(intro)
+
+
+class TemplateBackend:
+    """Deterministic backend that fills the platform templates locally.
+
+    Makes no network calls, so it works without an API key and answers
+    instantly. Combined requests get one draft per platform as JSON, and
+    repair requests return the post unchanged.
+    """
+
+    def __init__(self, metrics: Optional[MetricsRecorder] = None):
+        self.model = "template"
+        self.metrics = metrics or get_recorder()
+
+    def render(self, system_prompt: str, user_input: str) -> str:
+        """Answer a request built by the generation engine."""
+        if system_prompt == PromptManager.get_repair_prompt():
+            return user_input.partition("\nPost:\n")[2].strip()
+        fields, platforms = PromptManager.parse_event_context(user_input)
+        if len(platforms) > 1:
+            return json.dumps(
+                {platform.value: draft_post(fields, platform) for platform in platforms}
+            )
+        return draft_post(fields, platforms[0] if platforms else Platform.LINKEDIN)
+
+    def _measure(
+        self,
+        system_prompt: str,
+        user_input: str,
+        metrics: Optional[GenerationMetrics],
+        streaming: bool,
+    ) -> str:
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.streaming = streaming
+        metrics.start()
+        metrics.first_token()
+        result = self.render(system_prompt, user_input)
+        metrics.finish()
+        self.metrics.record(metrics)
+        return result
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> str:
+        """Generate a draft."""
+        return self._measure(system_prompt, user_input, metrics, streaming=False)
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+        stop: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Generate a draft as a single chunk."""
+        yield self._measure(system_prompt, user_input, metrics, streaming=True)
+
+    async def generate_candidates(
+        self,
+        system_prompt: str,
+        user_input: str,
+        count: int,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> list[str]:
+        """Generate the one draft there is."""
+        return [self._measure(system_prompt, user_input, metrics, streaming=False)]
+
+    async def warm_up(self) -> None:
+        """Nothing to warm up."""
+
+    async def aclose(self) -> None:
+        """Nothing to close."""
+
+
+@register_backend("openrouter")
+def _openrouter_backend(pool_size: Optional[int] = None) -> GenerationBackend:
+    from postman.llm import LLMClient
+
+    return LLMClient(pool_size=pool_size)
+
+
+@register_backend("openai")
+def _openai_compatible_backend(pool_size: Optional[int] = None) -> GenerationBackend:
+    from postman.llm import LLMClient
+
+    # Local servers usually ignore the key, but the SDK requires one
+    return LLMClient(
+        model=config.openai_model,
+        api_key=config.openai_api_key or "unused",
+        base_url=config.openai_base_url,
+        pool_size=pool_size,
+    )
+
+
+@register_backend("remote")
+def _remote_backend(pool_size: Optional[int] = None) -> GenerationBackend:
+    from postman.remote import RemoteBackend
+
+    return RemoteBackend(pool_size=pool_size)
+
+
+@register_backend("template")
+def _template_backend(pool_size: Optional[int] = None) -> GenerationBackend:
+    return TemplateBackend()
@@ -0,0 +1,142 @@
+"""Headless batch generation for JSONL files of events."""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from postman.backends import GenerationBackend
+from postman.config import config
+from postman.engine import GenerationEngine, format_error
+from postman.llm import get_shared_client
+from postman.prompts import EVENT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+def load_events(path: Path) -> list[Dict[str, str]]:
+    """Load events from a JSONL file, one JSON object per line.
+
+    Each event may carry an ``id``; otherwise its line number is used, so
+    the same file always produces the same job keys.
+    """
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON: {e}") from e
+            if not isinstance(data, dict):
+                raise ValueError(f"{path}:{line_no}: expected a JSON object")
+            event = {field: str(data.get(field, "")) for field in EVENT_FIELDS}
+            event["id"] = str(data.get("id", line_no))
+            events.append(event)
+    return events
+
+
+def job_key(event_id: str, platform: str) -> str:
+    """Build the checkpoint key for one event and platform."""
+    return f"{event_id}:{platform}"
+
+
+def load_completed(output_path: Path) -> set[str]:
+    """Read the job keys already finished successfully in ``output_path``.
+
+    The output file doubles as the checkpoint: every finished job is appended
+    as soon as it completes, so an interrupted run can resume from it. Failed
+    jobs are not counted and will be retried.
+    """
+    completed: set[str] = set()
+    if not output_path.exists():
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted write
+                continue
+            if record.get("error") is None:
+                completed.add(job_key(record["id"], record["platform"]))
+    return completed
+
+
+async def run_batch(
+    events_path: Path,
+    output_path: Path,
+    platforms: Iterable[str],
+    concurrency: int = 4,
+    client: Optional[GenerationBackend] = None,
+    use_cache: bool = True,
+) -> Dict[str, int]:
+    """Generate posts for every event and platform with a bounded worker pool.
+
+    Results are appended to ``output_path`` as JSON lines as soon as each job
+    finishes. Returns counts of succeeded, failed and skipped jobs.
+    """
+    events = load_events(events_path)
+    completed = load_completed(output_path)
+    client = client or get_shared_client(pool_size=max(concurrency, config.pool_size))
+    engine = GenerationEngine(client, concurrency)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    skipped = 0
+    for event in events:
+        for platform in platforms:
+            if job_key(event["id"], platform) in completed:
+                skipped += 1
+            else:
+                queue.put_nowait((event, platform))
+
+    total = queue.qsize()
+    summary = {"succeeded": 0, "failed": 0, "skipped": skipped}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, "a", encoding="utf-8") as output:
+
+        async def worker() -> None:
+            while True:
+                try:
+                    event, platform = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                error = None
+                result = ""
+                try:
+                    result = await engine.generate_one(
+                        event, platform, use_cache=use_cache
+                    )
+                except Exception as e:
+                    error = format_error(e)
+
+                record = {
+                    "id": event["id"],
+                    "platform": platform,
+                    "title": event["title"],
+                    "output": result,
+                    "error": error,
+                    "finished_at": time.time(),
+                }
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+
+                summary["failed" if error else "succeeded"] += 1
+                done = summary["succeeded"] + summary["failed"]
+                logger.info(
+                    "[%d/%d] %s %s %s",
+                    done,
+                    total,
+                    event["id"],
+                    platform,
+                    error or "ok",
+                )
+
+        workers = max(1, min(concurrency, total))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    return summary
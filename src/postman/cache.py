@@ -0,0 +1,163 @@
+"""Persistent on-disk cache for LLM responses."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Optional
+
+from postman.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """SQLite-backed response cache with LRU eviction and a TTL.
+
+    Database errors, such as a file locked by another process or a corrupt
+    file, are logged and treated as cache misses so they never fail a
+    generation.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 1000, ttl: float = 604800):
+        """Open (or create) the cache database at ``path``.
+
+        ``max_entries`` bounds the number of stored responses; the least
+        recently used entries are evicted first. Entries older than ``ttl``
+        seconds are treated as missing.
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._conn = self._open(str(self.path))
+        except sqlite3.Error as e:
+            logger.warning(
+                "Response cache at %s is unusable, caching in memory: %s",
+                self.path,
+                e,
+            )
+            self._conn = self._open(":memory:")
+
+    @staticmethod
+    def _open(database: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(database)
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                "ON responses (accessed_at)"
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    @classmethod
+    def from_config(cls) -> "ResponseCache":
+        """Create a cache using the configured location and limits."""
+        return cls(
+            config.cache_path,
+            max_entries=config.cache_max_entries,
+            ttl=config.cache_ttl,
+        )
+
+    @staticmethod
+    def make_key(
+        model: str, system_prompt: str, user_input: str, candidates: int = 1
+    ) -> str:
+        """Build a cache key from everything that determines a response.
+
+        Sets of ``candidates`` alternative posts are cached apart from
+        single posts.
+        """
+        parts: list = [model, system_prompt, user_input]
+        if candidates > 1:
+            parts.append(candidates)
+        payload = json.dumps(parts)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or ``None`` if missing or expired."""
+        try:
+            return self._get(key)
+        except sqlite3.Error as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            self._rollback()
+            return None
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        response, created_at = row
+        now = time.time()
+        if now - created_at > self.ttl:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+
+        self._conn.execute(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+        )
+        self._conn.commit()
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response and evict the least recently used overflow."""
+        try:
+            self._set(key, response)
+        except sqlite3.Error as e:
+            logger.warning("Response cache update failed: %s", e)
+            self._rollback()
+
+    def _set(self, key: str, response: str) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, response, now, now),
+        )
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+        )
+        self._conn.execute(
+            """
+            DELETE FROM responses WHERE key NOT IN (
+                SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?
+            )
+            """,
+            (self.max_entries,),
+        )
+        self._conn.commit()
+
+    def _rollback(self) -> None:
+        """Drop a transaction left half done by an error."""
+        with suppress(sqlite3.Error):
+            self._conn.rollback()
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -0,0 +1,193 @@
+"""Command-line entry point for Postman."""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+from postman.config import config
+from postman.profiling import profile_session, watch_loop
+from postman.prompts import Platform
+
+PLATFORM_CHOICES = [platform.value for platform in Platform]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the ``postman`` command."""
+    parser = argparse.ArgumentParser(
+        prog="postman",
+        description="Generate social media posts for HKPUG events.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser(
+        "batch", help="Generate posts for a JSONL file of events without the TUI"
+    )
+    batch.add_argument("events", type=Path, help="JSONL file with one event per line")
+    batch.add_argument(
+        "--platforms",
+        nargs="+",
+        choices=PLATFORM_CHOICES,
+        default=["linkedin"],
+        help="Platforms to generate for (default: linkedin)",
+    )
+    batch.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="Output JSONL file, also used to resume (default: <events>.posts.jsonl)",
+    )
+    batch.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=config.max_concurrency,
+        help="Maximum jobs in flight (default: POSTMAN_MAX_CONCURRENCY)",
+    )
+    batch.add_argument(
+        "--no-cache", action="store_true", help="Bypass the response cache"
+    )
+
+    review = subparsers.add_parser(
+        "review", help="Browse, filter and copy the posts from a batch run"
+    )
+    review.add_argument("results", type=Path, help="Output JSONL file of a batch run")
+
+    serve = subparsers.add_parser(
+        "serve", help="Serve generation over HTTP to share one client between users"
+    )
+    serve.add_argument(
+        "--host",
+        default=config.serve_host,
+        help="Interface to listen on (default: POSTMAN_SERVE_HOST)",
+    )
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=config.serve_port,
+        help="Port to listen on (default: POSTMAN_SERVE_PORT)",
+    )
+    serve.add_argument(
+        "--backend",
+        help="Backend the server generates with (default: POSTMAN_BACKEND, "
+        "or openrouter if that is remote)",
+    )
+    return parser
+
+
+def run_batch_command(args: argparse.Namespace) -> int:
+    """Run the ``batch`` subcommand and return the exit status."""
+    from postman.batch import run_batch
+    from postman.llm import close_shared_client
+
+    logging.basicConfig(
+        level=logging.DEBUG if config.debug else logging.INFO,
+        format="%(message)s",
+    )
+    output = args.output or args.events.with_suffix(".posts.jsonl")
+
+    async def run() -> dict:
+        watch_loop()
+        try:
+            return await run_batch(
+                args.events,
+                output,
+                args.platforms,
+                concurrency=args.concurrency,
+                use_cache=not args.no_cache,
+            )
+        finally:
+            await close_shared_client()
+
+    try:
+        summary = asyncio.run(run())
+    except (OSError, ValueError) as e:
+        print(f"postman batch: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print(f"Interrupted; rerun to resume from {output}", file=sys.stderr)
+        return 130
+
+    print(
+        f"{summary['succeeded']} succeeded, {summary['failed']} failed, "
+        f"{summary['skipped']} already done -> {output}"
+    )
+    return 1 if summary["failed"] else 0
+
+
+def run_review_command(args: argparse.Namespace) -> int:
+    """Run the ``review`` subcommand and return the exit status."""
+    from postman.results import ReviewApp, load_results
+
+    try:
+        records = load_results(args.results)
+    except OSError as e:
+        print(f"postman review: {e}", file=sys.stderr)
+        return 2
+    ReviewApp(records, source=str(args.results)).run()
+    return 0
+
+
+def run_serve_command(args: argparse.Namespace) -> int:
+    """Run the ``serve`` subcommand and return the exit status."""
+    from postman.backends import create_backend
+    from postman.server import PostmanServer
+
+    logging.basicConfig(
+        level=logging.DEBUG if config.debug else logging.INFO,
+        format="%(asctime)s %(message)s",
+    )
+    name = args.backend or config.backend
+    if name == "remote":
+        if args.backend:
+            print(
+                "postman serve: the server can't use the remote backend",
+                file=sys.stderr,
+            )
+            return 2
+        # A .env shared with remote clients names the server itself
+        name = "openrouter"
+
+    async def run() -> None:
+        watch_loop()
+        backend = create_backend(name)
+        server = PostmanServer(backend, args.host, args.port, token=config.serve_token)
+        try:
+            await server.start()
+            await backend.warm_up()
+            print(f"Serving {backend.model} on {server.url}", file=sys.stderr)
+            await server.serve_forever()
+        finally:
+            await server.close()
+            await backend.aclose()
+
+    try:
+        asyncio.run(run())
+    except (OSError, ValueError) as e:
+        print(f"postman serve: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Main entry point for the postman CLI."""
+    args = build_parser().parse_args(argv)
+    with profile_session():
+        if args.command == "batch":
+            sys.exit(run_batch_command(args))
+        if args.command == "review":
+            sys.exit(run_review_command(args))
+        if args.command == "serve":
+            sys.exit(run_serve_command(args))
+
+        from postman.app import main as run_app
+
+        run_app()
+
+
+if __name__ == "__main__":
+    main()
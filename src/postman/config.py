@@ -1,6 +1,7 @@
 from pathlib import Path
 import os
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,61 @@ class Config:
         """Get OpenRouter model configuration."""
         return os.getenv("OPENROUTER_MODEL", "gpt-3.5-turbo")
 
+    @property
+    def base_url(self) -> str:
+        """Get the OpenAI-compatible API base URL."""
+        url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+        return url.rstrip("/")
+
+    @property
+    def backend(self) -> str:
+        """Get the name of the generation backend."""
+        return os.getenv("POSTMAN_BACKEND", "openrouter").strip().lower()
+
+    @property
+    def openai_base_url(self) -> str:
+        """Get the endpoint of the OpenAI-compatible backend."""
+        url = os.getenv("POSTMAN_OPENAI_BASE_URL", "http://localhost:11434/v1")
+        return url.rstrip("/")
+
+    @property
+    def openai_api_key(self) -> str:
+        """Get the API key for the OpenAI-compatible backend, often unused."""
+        return os.getenv("POSTMAN_OPENAI_API_KEY", "")
+
+    @property
+    def openai_model(self) -> str:
+        """Get the model served by the OpenAI-compatible backend."""
+        return os.getenv("POSTMAN_OPENAI_MODEL") or self.model
+
+    @property
+    def remote_url(self) -> str:
+        """Get the address of the Postman server used by the remote backend."""
+        return os.getenv("POSTMAN_REMOTE_URL", "http://127.0.0.1:8787").rstrip("/")
+
+    @property
+    def serve_host(self) -> str:
+        """Get the interface ``postman serve`` listens on."""
+        return os.getenv("POSTMAN_SERVE_HOST", "127.0.0.1")
+
+    @property
+    def serve_port(self) -> int:
+        """Get the port ``postman serve`` listens on."""
+        return int(os.getenv("POSTMAN_SERVE_PORT", "8787"))
+
+    @property
+    def serve_token(self) -> str:
+        """Get the bearer token shared by the Postman server and its clients.
+
+        Empty means the server accepts requests without a token.
+        """
+        return os.getenv("POSTMAN_SERVE_TOKEN", "")
+
+    @property
+    def instant_drafts(self) -> bool:
+        """Check if template drafts are shown while the LLM generates."""
+        return os.getenv("POSTMAN_DRAFTS", "1") == "1"
+
     @property
     def min_width(self) -> int:
         """Get minimum terminal width."""
@@ -70,6 +126,200 @@ class Config:
         """Get content length setting."""
         return int(os.getenv("POSTMAN_CONTENT_LENGTH", "3"))
 
+    @property
+    def max_concurrency(self) -> int:
+        """Get maximum number of platforms generated at the same time."""
+        return int(os.getenv("POSTMAN_MAX_CONCURRENCY", "4"))
+
+    @property
+    def multi_platform(self) -> bool:
+        """Check if all platforms are requested together in one call."""
+        return os.getenv("POSTMAN_MULTI_PLATFORM", "0") == "1"
+
+    @property
+    def pool_size(self) -> int:
+        """Get the HTTP connection pool size.
+
+        Defaults to the generation concurrency so each platform in flight has
+        its own keep-alive connection.
+        """
+        return int(os.getenv("POSTMAN_POOL_SIZE", "0")) or self.max_concurrency
+
+    @property
+    def max_retries(self) -> int:
+        """Get how many times a transient failure is retried."""
+        return int(os.getenv("POSTMAN_MAX_RETRIES", "2"))
+
+    @property
+    def request_timeout(self) -> float:
+        """Get the per-attempt timeout in seconds.
+
+        For streaming requests this bounds the wait for the first token and
+        for each following chunk.
+        """
+        return float(os.getenv("POSTMAN_REQUEST_TIMEOUT", "20"))
+
+    @property
+    def breaker_threshold(self) -> int:
+        """Get how many consecutive outages open the circuit breaker."""
+        return int(os.getenv("POSTMAN_BREAKER_THRESHOLD", "5"))
+
+    @property
+    def breaker_cooldown(self) -> float:
+        """Get how long the open circuit breaker rejects calls, in seconds."""
+        return float(os.getenv("POSTMAN_BREAKER_COOLDOWN", "30"))
+
+    @property
+    def requests_per_minute(self) -> int:
+        """Get the default per-model request budget; 0 means unlimited."""
+        return int(os.getenv("POSTMAN_RPM", "0"))
+
+    @property
+    def tokens_per_minute(self) -> int:
+        """Get the default per-model token budget; 0 means unlimited."""
+        return int(os.getenv("POSTMAN_TPM", "0"))
+
+    def rate_limit(self, model: str) -> tuple[int, int]:
+        """Get the requests and tokens per minute allowed for ``model``.
+
+        ``POSTMAN_RATE_LIMITS`` overrides the defaults per model, as
+        comma-separated ``model=rpm:tpm`` entries.
+        """
+        for entry in os.getenv("POSTMAN_RATE_LIMITS", "").split(","):
+            name, _, limits = entry.strip().rpartition("=")
+            if name.strip() == model:
+                rpm, _, tpm = limits.partition(":")
+                return int(rpm or 0), int(tpm or 0)
+        return self.requests_per_minute, self.tokens_per_minute
+
+    @property
+    def adaptive_concurrency(self) -> bool:
+        """Check if concurrency adapts to rate limiting and latency spikes."""
+        return os.getenv("POSTMAN_ADAPTIVE_CONCURRENCY", "1") == "1"
+
+    @property
+    def fallback_models(self) -> list[str]:
+        """Get the models raced against a slow primary model."""
+        models = os.getenv("POSTMAN_FALLBACK_MODELS", "")
+        return [model.strip() for model in models.split(",") if model.strip()]
+
+    @property
+    def hedge_after(self) -> float:
+        """Get how long to wait for the primary model before hedging.
+
+        Zero disables hedged requests.
+        """
+        return float(os.getenv("POSTMAN_HEDGE_AFTER", "0"))
+
+    @property
+    def candidates(self) -> int:
+        """Get how many alternative posts are generated per platform."""
+        return max(1, int(os.getenv("POSTMAN_CANDIDATES", "1")))
+
+    @property
+    def validate_posts(self) -> bool:
+        """Check if generated posts are checked and fixed against format rules."""
+        return os.getenv("POSTMAN_VALIDATE", "1") == "1"
+
+    @property
+    def repair_posts(self) -> bool:
+        """Check if posts local fixes can't repair are sent back to the LLM."""
+        return os.getenv("POSTMAN_REPAIR", "1") == "1"
+
+    @property
+    def structured_output(self) -> bool:
+        """Check if streamed posts are written and parsed field by field."""
+        return os.getenv("POSTMAN_STRUCTURED", "0") == "1"
+
+    @property
+    def speculative(self) -> bool:
+        """Check if posts are generated in the background while typing."""
+        return os.getenv("POSTMAN_SPECULATIVE", "0") == "1"
+
+    @property
+    def speculative_delay(self) -> float:
+        """Get how long the form must be idle before generating speculatively."""
+        return float(os.getenv("POSTMAN_SPECULATIVE_DELAY", "1.5"))
+
+    @property
+    def cache_enabled(self) -> bool:
+        """Check if the on-disk response cache is enabled."""
+        return os.getenv("POSTMAN_CACHE", "1") == "1"
+
+    @property
+    def cache_path(self) -> Path:
+        """Get the response cache database location."""
+        default = Path.home() / ".cache" / "postman" / "responses.db"
+        return Path(os.getenv("POSTMAN_CACHE_PATH", str(default))).expanduser()
+
+    @property
+    def cache_ttl(self) -> float:
+        """Get how long cached responses stay valid, in seconds."""
+        return float(os.getenv("POSTMAN_CACHE_TTL", "604800"))
+
+    @property
+    def cache_max_entries(self) -> int:
+        """Get the maximum number of cached responses."""
+        return int(os.getenv("POSTMAN_CACHE_MAX_ENTRIES", "1000"))
+
+    @property
+    def history_enabled(self) -> bool:
+        """Check if generated posts are saved to the searchable history."""
+        return os.getenv("POSTMAN_HISTORY", "1") == "1"
+
+    @property
+    def history_path(self) -> Path:
+        """Get the post history database location."""
+        default = Path.home() / ".cache" / "postman" / "history.db"
+        return Path(os.getenv("POSTMAN_HISTORY_PATH", str(default))).expanduser()
+
+    @property
+    def reuse_similar(self) -> bool:
+        """Check if posts for near-identical past events are reused."""
+        return os.getenv("POSTMAN_REUSE", "0") == "1"
+
+    @property
+    def reuse_threshold(self) -> float:
+        """Get the similarity above which a past post is reused as is.
+
+        Its title, date, time and location are swapped for the new event's
+        and no LLM call is made.
+        """
+        return float(os.getenv("POSTMAN_REUSE_THRESHOLD", "0.95"))
+
+    @property
+    def seed_threshold(self) -> float:
+        """Get the similarity above which a past post seeds a shorter prompt."""
+        return float(os.getenv("POSTMAN_SEED_THRESHOLD", "0.5"))
+
+    @property
+    def metrics_path(self) -> Optional[Path]:
+        """Get the JSONL file generation metrics are appended to, if any."""
+        path = os.getenv("POSTMAN_METRICS_PATH", "")
+        return Path(path).expanduser() if path else None
+
+    @property
+    def metrics_prometheus_path(self) -> Optional[Path]:
+        """Get the Prometheus textfile to write metrics to, if any."""
+        path = os.getenv("POSTMAN_METRICS_PROM", "")
+        return Path(path).expanduser() if path else None
+
+    @property
+    def profile(self) -> bool:
+        """Check if sessions are profiled and the profile written on exit."""
+        return os.getenv("POSTMAN_PROFILE", "0") == "1"
+
+    @property
+    def profile_path(self) -> Path:
+        """Get the directory session profiles are written to."""
+        default = Path.home() / ".cache" / "postman" / "profiles"
+        return Path(os.getenv("POSTMAN_PROFILE_PATH", str(default))).expanduser()
+
+    @property
+    def profile_interval(self) -> float:
+        """Get how often the session profiler samples stacks, in seconds."""
+        return float(os.getenv("POSTMAN_PROFILE_INTERVAL", "0.01"))
+
     @property
     def debug(self) -> bool:
         """Check if debug mode is enabled."""
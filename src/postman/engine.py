@@ -0,0 +1,531 @@
+"""Concurrent generation engine for multi-platform posts."""
+
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import time
+from typing import Callable, Dict, Mapping, Optional
+
+from postman.backends import GenerationBackend
+from postman.config import config
+from postman.history import HistoryEntry, PostHistory
+from postman.llm import LLMError
+from postman.metrics import GenerationMetrics
+from postman.prompts import Platform, PromptManager
+from postman.ranking import rank_candidates
+from postman.similarity import (
+    INDEXED_POSTS,
+    SimilarityIndex,
+    SimilarMatch,
+    substitute_details,
+)
+from postman.structured import END_MARKER, FieldEvent, StructuredParser
+from postman.validation import check_field, fix_format
+
+logger = logging.getLogger(__name__)
+
+ResultCallback = Callable[[str, str, bool], None]
+ChunkCallback = Callable[[str, str], None]
+CandidatesCallback = Callable[[str, list[str]], None]
+FieldCallback = Callable[[str, str, list[str]], None]
+SourceCallback = Callable[[str, str], None]
+
+
+def build_request(fields: Mapping[str, str], platform: Platform) -> tuple[str, str]:
+    """Build the system prompt and user input for a platform."""
+    system_prompt = PromptManager.get_prompt(platform)
+    user_input = PromptManager.build_event_context(
+        title=fields.get("title", ""),
+        date=fields.get("date", ""),
+        time=fields.get("time", ""),
+        location=fields.get("location", ""),
+        description=fields.get("description", ""),
+        platform=platform,
+    )
+    return system_prompt, user_input
+
+
+def build_multi_platform_request(
+    fields: Mapping[str, str], platforms: list[Platform]
+) -> tuple[str, str]:
+    """Build the system prompt and user input for a combined request."""
+    system_prompt = PromptManager.get_multi_platform_prompt(platforms)
+    user_input = PromptManager.build_multi_platform_context(
+        title=fields.get("title", ""),
+        date=fields.get("date", ""),
+        time=fields.get("time", ""),
+        location=fields.get("location", ""),
+        description=fields.get("description", ""),
+        platforms=platforms,
+    )
+    return system_prompt, user_input
+
+
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def parse_multi_platform_response(text: str, platforms: list[str]) -> Dict[str, str]:
+    """Extract per-platform posts from a combined JSON response.
+
+    Tolerates code fences and prose around the JSON object. Only platforms
+    with a non-empty string value are returned; raises ``ValueError`` if no
+    JSON object can be found at all.
+    """
+    fenced = _CODE_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("No JSON object in response")
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text[start:])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in response: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("Response JSON is not an object")
+
+    normalized = {str(key).strip().lower(): value for key, value in data.items()}
+    posts = {}
+    for platform_name in platforms:
+        value = normalized.get(platform_name)
+        if isinstance(value, str) and value.strip():
+            posts[platform_name] = value.strip()
+    return posts
+
+
+def build_repair_request(
+    post: str, problems: list[str], platform: Platform
+) -> tuple[str, str]:
+    """Build the system prompt and user input for a format repair."""
+    system_prompt = PromptManager.get_repair_prompt()
+    user_input = PromptManager.build_repair_context(post, problems, platform)
+    return system_prompt, user_input
+
+
+def build_seed_request(
+    previous_post: str, fields: Mapping[str, str], platform: Platform
+) -> tuple[str, str]:
+    """Build the system prompt and user input for adapting a past post."""
+    system_prompt = PromptManager.get_seed_prompt()
+    user_input = PromptManager.build_seed_context(previous_post, fields, platform)
+    return system_prompt, user_input
+
+
+def format_error(error: Exception) -> str:
+    """Format a generation error for display in place of the post."""
+    if isinstance(error, LLMError):
+        return f"Generation failed: {error}"
+    return f"Error: {error}"
+
+
+class GenerationEngine:
+    """Runs per-platform generations concurrently with a bounded limit."""
+
+    def __init__(
+        self,
+        client: GenerationBackend,
+        max_concurrency: Optional[int] = None,
+        multi_platform: Optional[bool] = None,
+        candidates: Optional[int] = None,
+        history: Optional[PostHistory] = None,
+    ):
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency or config.max_concurrency)
+        self.multi_platform = (
+            config.multi_platform if multi_platform is None else multi_platform
+        )
+        self.candidates = max(1, candidates or config.candidates)
+        self.validate = config.validate_posts
+        self.repair = config.repair_posts
+        if history is None and config.history_enabled:
+            history = PostHistory.from_config()
+        self.history = history
+        self.reuse_similar = config.reuse_similar
+        self.structured = config.structured_output
+        self._similar: Optional[SimilarityIndex] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def generate_one(
+        self, fields: Mapping[str, str], platform_name: str, use_cache: bool = True
+    ) -> str:
+        """Generate a post for a single platform."""
+        reused = self.reuse(fields, platform_name, use_cache)
+        if reused is not None:
+            return reused
+        system_prompt, user_input = self.request_for(fields, platform_name, use_cache)
+        metrics = GenerationMetrics(label=platform_name)
+        async with self._semaphore:
+            result = await self.client.generate(
+                system_prompt, user_input, use_cache=use_cache, metrics=metrics
+            )
+        result = await self.finalize(fields, platform_name, result, use_cache)
+        self.remember(fields, platform_name, result, metrics)
+        return result
+
+    async def stream_one(
+        self,
+        fields: Mapping[str, str],
+        platform_name: str,
+        on_chunk: ChunkCallback,
+        use_cache: bool = True,
+        on_field: Optional[FieldCallback] = None,
+    ) -> str:
+        """Stream a post for a single platform, reporting each chunk.
+
+        In structured mode the model writes the post's fields under markers.
+        Chunks then report the post's text without the markers, and
+        ``on_field`` receives each field's format problems as soon as the
+        field is complete. The stream is stopped at the post's end marker
+        rather than when the model stops writing.
+        """
+        reused = self.reuse(fields, platform_name, use_cache)
+        if reused is not None:
+            on_chunk(platform_name, reused)
+            return reused
+        platform = Platform(platform_name)
+        system_prompt, user_input = self.request_for(fields, platform_name, use_cache)
+        parser: Optional[StructuredParser] = None
+        # Seeded requests adapt a past post as written instead
+        if self.structured and system_prompt == PromptManager.get_prompt(platform):
+            system_prompt = PromptManager.get_structured_prompt(platform)
+            parser = StructuredParser()
+        started: set[str] = set()
+
+        def report(events: list[FieldEvent]) -> None:
+            for event in events:
+                if not event.done:
+                    new_field = bool(started) and event.field not in started
+                    started.add(event.field)
+                    on_chunk(platform_name, ("\n\n" if new_field else "") + event.text)
+                elif on_field is not None:
+                    problems = (
+                        check_field(event.field, event.text, platform)
+                        if self.validate
+                        else []
+                    )
+                    on_field(platform_name, event.field, problems)
+
+        chunks: list[str] = []
+        metrics = GenerationMetrics(label=platform_name)
+        async with self._semaphore:
+            stream = self.client.generate_stream(
+                system_prompt,
+                user_input,
+                use_cache=use_cache,
+                metrics=metrics,
+                stop=None if parser is None else END_MARKER,
+            )
+            try:
+                async for chunk in stream:
+                    if parser is None:
+                        chunks.append(chunk)
+                        on_chunk(platform_name, chunk)
+                        continue
+                    report(parser.feed(chunk))
+                    # The client ends the stream at [END]; this catches restarts
+                    if parser.finished:
+                        logger.debug("Stopped %s stream at its end", platform_name)
+                        break
+            finally:
+                await stream.aclose()
+        if parser is None:
+            text = "".join(chunks)
+        else:
+            report(parser.close())
+            text = parser.text()
+            if not started:
+                # The model ignored the markers; show its post as written
+                on_chunk(platform_name, text)
+        result = await self.finalize(fields, platform_name, text, use_cache)
+        self.remember(fields, platform_name, result, metrics)
+        return result
+
+    async def generate_candidates(
+        self,
+        fields: Mapping[str, str],
+        platform_name: str,
+        count: int,
+        use_cache: bool = True,
+    ) -> list[str]:
+        """Generate alternative posts for a single platform, best first."""
+        reused = self.reuse(fields, platform_name, use_cache)
+        if reused is not None:
+            return [reused]
+        platform = Platform(platform_name)
+        system_prompt, user_input = self.request_for(fields, platform_name, use_cache)
+        metrics = GenerationMetrics(label=platform_name)
+        async with self._semaphore:
+            candidates = await self.client.generate_candidates(
+                system_prompt, user_input, count, use_cache=use_cache, metrics=metrics
+            )
+        if self.validate:
+            candidates = [
+                fix_format(candidate, platform, fields)[0] for candidate in candidates
+            ]
+        ranked = rank_candidates(candidates, platform)
+        ranked[0] = await self.finalize(fields, platform_name, ranked[0], use_cache)
+        self.remember(fields, platform_name, ranked[0], metrics)
+        return ranked
+
+    async def generate_combined(
+        self, fields: Mapping[str, str], platforms: list[str], use_cache: bool = True
+    ) -> Dict[str, str]:
+        """Generate posts for several platforms in a single request.
+
+        Returns the platforms that could be parsed from the response; any
+        platform missing from the result should be generated on its own.
+        """
+        system_prompt, user_input = build_multi_platform_request(
+            fields, [Platform(name) for name in platforms]
+        )
+        metrics = GenerationMetrics(label="+".join(platforms))
+        async with self._semaphore:
+            text = await self.client.generate(
+                system_prompt,
+                user_input,
+                max_sentences=None,
+                use_cache=use_cache,
+                metrics=metrics,
+            )
+        posts = parse_multi_platform_response(text, platforms)
+        fixed = await asyncio.gather(
+            *(
+                self.finalize(fields, platform_name, post, use_cache)
+                for platform_name, post in posts.items()
+            )
+        )
+        for platform_name, post in zip(posts, fixed):
+            self.remember(fields, platform_name, post, metrics)
+        return dict(zip(posts, fixed))
+
+    def remember(
+        self,
+        fields: Mapping[str, str],
+        platform_name: str,
+        post: str,
+        metrics: GenerationMetrics,
+    ) -> None:
+        """Save a finished post to the history, if it is enabled."""
+        if self.history is None or not post.strip():
+            return
+        model = metrics.model or self.client.model
+        try:
+            entry_id = self.history.add(fields, platform_name, model, post)
+        except sqlite3.Error as e:
+            # Losing a history entry must never lose the post itself
+            logger.warning("Could not save %s post to history: %s", platform_name, e)
+            return
+        if self._similar is not None:
+            self._similar.add(
+                HistoryEntry(
+                    entry_id, platform_name, model, post, time.time(), dict(fields)
+                )
+            )
+
+    def find_similar(
+        self, fields: Mapping[str, str], platform_name: str, use_cache: bool = True
+    ) -> Optional[SimilarMatch]:
+        """Find the past post whose event is most like this one.
+
+        Disabled without a history, and for fresh generations that bypass
+        the cache. The index is loaded from the history on first use.
+        """
+        if not (use_cache and self.reuse_similar and self.history is not None):
+            return None
+        if self._similar is None:
+            try:
+                entries = self.history.search(limit=INDEXED_POSTS)
+            except sqlite3.Error as e:
+                logger.warning("Could not load history for reuse: %s", e)
+                entries = []
+            self._similar = SimilarityIndex.from_entries(entries)
+        return self._similar.best_match(fields, Platform(platform_name))
+
+    def reuse(
+        self, fields: Mapping[str, str], platform_name: str, use_cache: bool = True
+    ) -> Optional[str]:
+        """Reuse the post of a near-identical past event, if there is one.
+
+        The past event's title, date, time and location are swapped for
+        this one's. A post that then breaks the format rules is not reused.
+        """
+        match = self.find_similar(fields, platform_name, use_cache)
+        if match is None or match.score < config.reuse_threshold:
+            return None
+        post = substitute_details(match.entry.output, match.entry.fields, fields)
+        if post is None:
+            return None
+        if self.validate:
+            post, problems = fix_format(post, Platform(platform_name), fields)
+            if problems:
+                return None
+        logger.debug(
+            "Reusing %s post %d (similarity %.2f)",
+            platform_name,
+            match.entry.id,
+            match.score,
+        )
+        self.remember(
+            fields,
+            platform_name,
+            post,
+            GenerationMetrics(label=platform_name, model=match.entry.model),
+        )
+        return post
+
+    def request_for(
+        self, fields: Mapping[str, str], platform_name: str, use_cache: bool = True
+    ) -> tuple[str, str]:
+        """Build a platform's request, seeded with a similar past post if any.
+
+        A seeded request sends the past post and a short instruction to
+        adapt it instead of the full platform prompt.
+        """
+        platform = Platform(platform_name)
+        match = self.seed_for(fields, platform_name, use_cache)
+        if match is not None:
+            return build_seed_request(match.entry.output, fields, platform)
+        return build_request(fields, platform)
+
+    def seed_for(
+        self, fields: Mapping[str, str], platform_name: str, use_cache: bool = True
+    ) -> Optional[SimilarMatch]:
+        """Find the past post a platform's request would be seeded with."""
+        match = self.find_similar(fields, platform_name, use_cache)
+        if match is not None and match.score >= config.seed_threshold:
+            return match
+        return None
+
+    async def finalize(
+        self,
+        fields: Mapping[str, str],
+        platform_name: str,
+        post: str,
+        use_cache: bool = True,
+    ) -> str:
+        """Check a post against its format rules and fix what breaks them.
+
+        Deterministic fixes are applied locally. Only if problems remain is a
+        short repair request sent, with just the post and its problems; the
+        repair is kept if it leaves fewer problems than before.
+        """
+        if not self.validate:
+            return post
+        platform = Platform(platform_name)
+        fixed, problems = fix_format(post, platform, fields)
+        if not problems or not self.repair:
+            return fixed
+
+        system_prompt, user_input = build_repair_request(fixed, problems, platform)
+        metrics = GenerationMetrics(label=f"{platform_name} repair")
+        try:
+            async with self._semaphore:
+                repaired = await self.client.generate(
+                    system_prompt,
+                    user_input,
+                    max_sentences=None,
+                    use_cache=use_cache,
+                    metrics=metrics,
+                )
+        except LLMError as e:
+            logger.debug("Repair of %s post failed: %s", platform_name, e)
+            return fixed
+        repaired, remaining = fix_format(repaired, platform, fields)
+        return repaired if len(remaining) < len(problems) else fixed
+
+    async def generate_all(
+        self,
+        fields: Mapping[str, str],
+        platforms: list[str],
+        on_result: Optional[ResultCallback] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+        use_cache: bool = True,
+        on_candidates: Optional[CandidatesCallback] = None,
+        on_field: Optional[FieldCallback] = None,
+        on_source: Optional[SourceCallback] = None,
+    ) -> Dict[str, str]:
+        """Generate posts for all platforms concurrently.
+
+        ``on_result`` is called with the platform, its post (or error message)
+        and whether it succeeded as soon as each platform finishes, so callers
+        can update their display without waiting for the slowest platform.
+        When ``on_chunk`` is given, platforms are streamed and every chunk is
+        reported as it arrives, with ``on_field`` receiving each completed
+        field's problems in structured mode. A failure for one platform is
+        reported as that platform's result and never affects the others.
+        ``use_cache=False`` bypasses the response cache.
+
+        When the engine asks for several candidates, each platform's are
+        generated in one request instead of streamed, ``on_candidates``
+        receives them ranked best first, and the best one is the result.
+
+        Platforms with a near-identical past event reuse its post without an
+        LLM call, and those with a similar one have the LLM adapt its post;
+        ``on_source`` is told which platforms were ``"reused"`` or
+        ``"adapted"`` before their result arrives. In multi-platform mode the
+        rest are first requested together; any platform the combined
+        response does not cover falls back to its own request.
+        """
+        results: Dict[str, str] = {}
+        for platform_name in platforms:
+            reused = self.reuse(fields, platform_name, use_cache)
+            if reused is not None:
+                results[platform_name] = reused
+                if on_source is not None:
+                    on_source(platform_name, "reused")
+                if on_result is not None:
+                    on_result(platform_name, reused, True)
+        remaining = [name for name in platforms if name not in results]
+
+        if self.multi_platform and len(remaining) > 1:
+            try:
+                combined = await self.generate_combined(
+                    fields, remaining, use_cache=use_cache
+                )
+            except Exception as e:
+                logger.debug("Multi-platform generation failed: %s", e)
+                combined = {}
+            for platform_name, result in combined.items():
+                results[platform_name] = result
+                if on_result is not None:
+                    on_result(platform_name, result, True)
+            remaining = [name for name in remaining if name not in combined]
+
+        async def run(platform_name: str) -> None:
+            succeeded = False
+            if on_source is not None and self.seed_for(
+                fields, platform_name, use_cache
+            ):
+                on_source(platform_name, "adapted")
+            try:
+                if self.candidates > 1:
+                    ranked = await self.generate_candidates(
+                        fields, platform_name, self.candidates, use_cache=use_cache
+                    )
+                    if on_candidates is not None:
+                        on_candidates(platform_name, ranked)
+                    result = ranked[0]
+                elif on_chunk is not None:
+                    result = await self.stream_one(
+                        fields,
+                        platform_name,
+                        on_chunk,
+                        use_cache=use_cache,
+                        on_field=on_field,
+                    )
+                else:
+                    result = await self.generate_one(
+                        fields, platform_name, use_cache=use_cache
+                    )
+                succeeded = True
+            except Exception as e:
+                result = format_error(e)
+            results[platform_name] = result
+            if on_result is not None:
+                on_result(platform_name, result, succeeded)
+
+        await asyncio.gather(*(run(platform_name) for platform_name in remaining))
+        return results
@@ -0,0 +1,195 @@
+"""Searchable on-disk history of generated posts."""
+
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from postman.config import config
+from postman.prompts import EVENT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+# Columns matched by searches, in the order they are indexed
+SEARCH_COLUMNS = ("title", "description", "location", "output")
+
+_ENTRY_COLUMNS = ("id", "platform", "model", "output", "created_at", *EVENT_FIELDS)
+
+
+@dataclass
+class HistoryEntry:
+    """One generated post and the event it was written for."""
+
+    id: int
+    platform: str
+    model: str
+    output: str
+    created_at: float
+    fields: Dict[str, str] = field(default_factory=dict)
+
+    def as_result(self) -> dict:
+        """Convert to a result record for the results view."""
+        return {
+            "id": str(self.id),
+            "platform": self.platform,
+            "title": self.fields.get("title", ""),
+            "output": self.output,
+            "error": None,
+            "finished_at": self.created_at,
+        }
+
+
+class PostHistory:
+    """SQLite store of every generated post with a full-text index.
+
+    Uses an FTS5 index when SQLite was built with it, and falls back to
+    ``LIKE`` matching otherwise.
+    """
+
+    def __init__(self, path: Path):
+        """Open (or create) the history database at ``path``."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id INTEGER PRIMARY KEY,
+                platform TEXT NOT NULL,
+                model TEXT NOT NULL,
+                title TEXT NOT NULL,
+                date TEXT NOT NULL,
+                time TEXT NOT NULL,
+                location TEXT NOT NULL,
+                description TEXT NOT NULL,
+                output TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS posts_created_at ON posts (created_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS posts_output ON posts (platform, output)"
+        )
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts "
+                f"USING fts5({', '.join(SEARCH_COLUMNS)})"
+            )
+            self.full_text = True
+        except sqlite3.OperationalError as e:
+            logger.debug("FTS5 unavailable, searching with LIKE: %s", e)
+            self.full_text = False
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls) -> "PostHistory":
+        """Open the history at the configured location."""
+        return cls(config.history_path)
+
+    def add(
+        self, fields: Mapping[str, str], platform: str, model: str, output: str
+    ) -> int:
+        """Record a generated post and return its id.
+
+        Generating the same post again, for example from the response
+        cache, only moves the existing entry to the top.
+        """
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT id FROM posts WHERE platform = ? AND output = ?",
+            (platform, output),
+        ).fetchone()
+        if row is not None:
+            self._conn.execute(
+                "UPDATE posts SET created_at = ?, model = ? WHERE id = ?",
+                (now, model, row[0]),
+            )
+            self._conn.commit()
+            return row[0]
+
+        values = [fields.get(name, "") for name in EVENT_FIELDS]
+        cursor = self._conn.execute(
+            f"INSERT INTO posts (platform, model, {', '.join(EVENT_FIELDS)}, "
+            "output, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (platform, model, *values, output, now),
+        )
+        entry_id = cursor.lastrowid
+        if self.full_text:
+            indexed = [fields.get(name, "") for name in SEARCH_COLUMNS[:-1]]
+            self._conn.execute(
+                f"INSERT INTO posts_fts (rowid, {', '.join(SEARCH_COLUMNS)}) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (entry_id, *indexed, output),
+            )
+        self._conn.commit()
+        return entry_id
+
+    def search(
+        self, query: str = "", platform: Optional[str] = None, limit: int = 200
+    ) -> list[HistoryEntry]:
+        """Find posts matching every word of ``query``, best match first.
+
+        Words match as prefixes, so results update while a word is being
+        typed. An empty query lists the most recent posts.
+        """
+        words = _WORD.findall(query)
+        columns = ", ".join(f"p.{name}" for name in _ENTRY_COLUMNS)
+        where = ["(? IS NULL OR p.platform = ?)"]
+        params: list = [platform, platform]
+        if not words:
+            sql = f"SELECT {columns} FROM posts p WHERE {where[0]} "
+            order = "ORDER BY p.created_at DESC"
+        elif self.full_text:
+            sql = (
+                f"SELECT {columns} FROM posts_fts f JOIN posts p ON p.id = f.rowid "
+                f"WHERE posts_fts MATCH ? AND {where[0]} "
+            )
+            params = [" ".join(f'"{word}"*' for word in words), *params]
+            order = "ORDER BY f.rank, p.created_at DESC"
+        else:
+            text = " || ' ' || ".join(f"p.{name}" for name in SEARCH_COLUMNS)
+            where += [f"({text}) LIKE ?"] * len(words)
+            params += [f"%{word}%" for word in words]
+            sql = f"SELECT {columns} FROM posts p WHERE {' AND '.join(where)} "
+            order = "ORDER BY p.created_at DESC"
+        rows = self._conn.execute(f"{sql}{order} LIMIT ?", (*params, limit))
+        return [self._entry(row) for row in rows]
+
+    def get(self, entry_id: int) -> Optional[HistoryEntry]:
+        """Get one post by id."""
+        columns = ", ".join(_ENTRY_COLUMNS)
+        row = self._conn.execute(
+            f"SELECT {columns} FROM posts WHERE id = ?", (entry_id,)
+        ).fetchone()
+        return None if row is None else self._entry(row)
+
+    @staticmethod
+    def _entry(row: tuple) -> HistoryEntry:
+        entry_id, platform, model, output, created_at, *values = row
+        return HistoryEntry(
+            id=entry_id,
+            platform=platform,
+            model=model,
+            output=output,
+            created_at=created_at,
+            fields=dict(zip(EVENT_FIELDS, values)),
+        )
+
+    def clear(self) -> None:
+        """Remove every post."""
+        self._conn.execute("DELETE FROM posts")
+        if self.full_text:
+            self._conn.execute("DELETE FROM posts_fts")
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -1,75 +1,842 @@
 """LLM integration module for OpenRouter API."""
 
-import os
-from typing import AsyncIterator, Optional
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import openai
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+from postman.backends import GenerationBackend, create_backend
+from postman.cache import ResponseCache
+from postman.config import config
+from postman.metrics import (
+    GenerationMetrics,
+    MetricsRecorder,
+    estimate_tokens,
+    get_recorder,
+)
+from postman.ratelimit import EXPECTED_OUTPUT_TOKENS, get_limiter
+from postman.resilience import CircuitBreaker, retrying
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle pooled connection is kept open for the next generation
+KEEPALIVE_EXPIRY = 60.0
+
+T = TypeVar("T")
 
 
 class LLMError(Exception):
     """Custom exception for LLM-related errors."""
 
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+class _Flight:
+    """One upstream call shared by identical concurrent requests.
 
-from postman.config import config
+    The call runs in its own task so it outlives any single caller; it is
+    only cancelled once every caller has left. Streamed chunks are kept so
+    callers that join late still see the whole response.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+        self.callers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def publish(self, chunk: str) -> None:
+        """Hand a streamed chunk to every caller."""
+        self.chunks.append(chunk)
+        self.wake()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[str]:
+        """Yield every chunk so far and then each new one until the call ends."""
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.task.done():
+                # Re-raises the call's error, if any
+                self.task.result()
+                return
+            await self._wakeup.wait()
+
+
+class _HeldStream:
+    """A stream that keeps its rate limiter slot until it is closed."""
+
+    def __init__(self, stream: AsyncIterator, release: Callable[[], None]):
+        self.stream = stream
+        self.release = release
+
+    def __aiter__(self) -> "_HeldStream":
+        return self
+
+    async def __anext__(self):
+        return await self.stream.__anext__()
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+def _partial_suffix(text: str, stop: Optional[str]) -> int:
+    """Get the length of the end of ``text`` that could be the start of ``stop``."""
+    if stop:
+        for length in range(min(len(stop) - 1, len(text)), 0, -1):
+            if text.endswith(stop[:length]):
+                return length
+    return 0
 
 
 class LLMClient:
     """Client for OpenRouter API using LangChain."""
 
-    def __init__(self, model: Optional[str] = None):
-        """Initialize LLM client with OpenRouter configuration."""
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        pool_size: Optional[int] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ):
+        """Initialize LLM client, by default with OpenRouter configuration."""
         self.model = model or config.model
-        self.api_key = config.api_key
+        self.api_key = api_key or config.api_key
+        self.base_url = (base_url or config.base_url).rstrip("/")
+        if cache is None and config.cache_enabled:
+            cache = ResponseCache.from_config()
+        self.cache = cache
+        self.metrics = metrics or get_recorder()
+        self.max_retries = config.max_retries
+        self.request_timeout = config.request_timeout
+        self.breaker = CircuitBreaker(
+            failure_threshold=config.breaker_threshold,
+            reset_timeout=config.breaker_cooldown,
+        )
+
+        # Hedged requests race the primary model against these fallbacks
+        self.hedge_after = config.hedge_after
+        self.fallback_models = config.fallback_models if self.hedge_after > 0 else []
 
+        # One keep-alive connection per platform that can be in flight, plus
+        # headroom for hedged requests racing alongside them
+        self.pool_size = pool_size or config.pool_size
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.pool_size * (1 + len(self.fallback_models)),
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+
+        self.client = self._make_chat_model(self.model)
+        self._fallback_clients: Dict[str, ChatOpenAI] = {}
+
+        # Identical requests in flight, keyed by kind and prompt
+        self._flights: Dict[tuple, _Flight] = {}
+
+    def _make_chat_model(self, model: str) -> ChatOpenAI:
+        """Create a chat model that shares this client's connection pool."""
         # OpenRouter uses OpenAI-compatible API
-        self.client = ChatOpenAI(
-            model=self.model,
+        return ChatOpenAI(
+            model=model,
             api_key=self.api_key,
-            base_url="https://openrouter.ai/api/v1",
+            base_url=self.base_url,
             streaming=True,
+            stream_usage=True,
+            http_async_client=self.http_client,
+            # Retries are handled by our own policy
+            max_retries=0,
         )
 
-    @retry(
-        retry=retry_if_exception_type(Exception),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True,
-    )
-    async def generate_stream(
-        self, system_prompt: str, user_input: str
-    ) -> AsyncIterator[str]:
-        """Generate content with streaming response."""
-        messages = [
-            SystemMessage(content=system_prompt),
+    def _chat_model_for(self, model: str) -> ChatOpenAI:
+        """Get the chat model for the primary or a fallback model."""
+        if model == self.model:
+            return self.client
+        if model not in self._fallback_clients:
+            self._fallback_clients[model] = self._make_chat_model(model)
+        return self._fallback_clients[model]
+
+    async def warm_up(self) -> None:
+        """Open the pooled connections ahead of the first generation.
+
+        Pays for DNS, TLS and connection setup up front so the first request
+        is as fast as later ones. Failures are ignored; the real request will
+        report them.
+        """
+
+        async def connect() -> None:
+            await self.http_client.head(
+                f"{self.base_url}/models",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+
+        results = await asyncio.gather(
+            *(connect() for _ in range(self.pool_size)), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug("Connection warm-up failed: %s", result)
+                break
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.http_client.aclose()
+
+    def _build_messages(
+        self, system_prompt: str, user_input: str, max_sentences: Optional[int]
+    ) -> list:
+        """Build the chat messages shared by streaming and non-streaming calls.
+
+        ``max_sentences=None`` leaves the system prompt unchanged, for
+        requests whose output is not a single post.
+        """
+        full_prompt = system_prompt
+        if max_sentences is not None:
+            full_prompt = (
+                f"{system_prompt}\n\n"
+                f"Generate a post in exactly {max_sentences} sentences."
+            )
+        return [
+            SystemMessage(content=full_prompt),
             HumanMessage(content=user_input),
         ]
 
+    async def _call(
+        self,
+        call: Callable[[], Awaitable[T]],
+        metrics: Optional[GenerationMetrics] = None,
+        model: Optional[str] = None,
+        tokens: int = 0,
+        kind: str = "request",
+        keep: Optional[Callable[[T, Callable[[], None]], T]] = None,
+    ) -> T:
+        """Run one request under the retry, timeout and circuit-breaker policy.
+
+        Only transient transport and HTTP errors are retried, and each attempt
+        is bounded by the request timeout. Every attempt also waits for a slot
+        from the rate limiter of ``model``, reserving ``tokens`` of its budget;
+        its latency counts towards the limiter's baseline for ``kind``. With
+        ``keep``, a successful attempt keeps its slot: ``keep`` is given the
+        result and the function that releases the slot, and returns the
+        result to hand back.
+        """
+        limiter = get_limiter(model or self.model, self.pool_size)
+        async for attempt in retrying(self.max_retries):
+            with attempt:
+                if metrics is not None and attempt.retry_state.attempt_number > 1:
+                    metrics.retries += 1
+                async with limiter.slot(
+                    tokens, kind, hold=keep is not None
+                ) as release:
+                    trial = self.breaker.before_call()
+                    try:
+                        async with asyncio.timeout(self.request_timeout):
+                            result = await call()
+                    except Exception as e:
+                        self.breaker.record_failure(e, trial)
+                        raise
+                    except BaseException:
+                        self.breaker.release(trial)
+                        raise
+                    self.breaker.record_success()
+                    if keep is not None:
+                        result = keep(result, release)
+        return result
+
+    async def _hedge(
+        self,
+        start: Callable[[ChatOpenAI], Awaitable[T]],
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> T:
+        """Race the primary model against fallbacks for tail latency.
+
+        ``start`` is first called with the primary model. If it has not
+        finished within ``hedge_after`` seconds, or fails, it is called again
+        with the next fallback model, and so on. The first success wins and
+        every other attempt is cancelled; ``discard`` cleans up results that
+        finished too late to win. The winning model is noted in ``metrics``.
+        """
+        if not self.fallback_models:
+            return await start(self.client)
+
+        queue = [self.model, *self.fallback_models]
+        tasks: Dict[asyncio.Task, str] = {}
+        winner: Optional[asyncio.Task] = None
+        error: Optional[BaseException] = None
+        try:
+            while winner is None:
+                if queue:
+                    model = queue.pop(0)
+                    task = asyncio.create_task(start(self._chat_model_for(model)))
+                    tasks[task] = model
+                pending = [task for task in tasks if not task.done()]
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        break
+                    error = error or task.exception()
+        finally:
+            for task in tasks:
+                if task is not winner and not task.done():
+                    task.cancel()
+            await asyncio.gather(
+                *(task for task in tasks if task is not winner),
+                return_exceptions=True,
+            )
+            if discard is not None:
+                for task in tasks:
+                    if task is not winner and not task.cancelled():
+                        if task.exception() is None:
+                            await discard(task.result())
+
+        if winner is None:
+            raise error
+        if tasks[winner] != self.model:
+            logger.info("Hedged request won by fallback model %s", tasks[winner])
+        if metrics is not None:
+            metrics.model = tasks[winner]
+        return winner.result()
+
+    async def _open_stream(
+        self,
+        chat_model: ChatOpenAI,
+        messages: list,
+        metrics: Optional[GenerationMetrics] = None,
+        stop: Optional[str] = None,
+    ) -> tuple[str, AsyncIterator]:
+        """Start a stream and wait for its first content chunk.
+
+        Retries happen here, before anything has been shown to the caller;
+        once the first chunk is returned the stream can no longer be
+        restarted transparently. The stream keeps its rate limiter slot
+        until it is closed, and is timed to its first chunk.
+        """
+
+        async def first_chunk() -> tuple[str, AsyncIterator]:
+            stream = chat_model.astream(messages, stop=[stop] if stop else None)
+            try:
+                async for chunk in stream:
+                    if chunk.content:
+                        return str(chunk.content), stream
+            except BaseException:
+                await stream.aclose()
+                raise
+            return "", stream
+
+        def hold(
+            opened: tuple[str, AsyncIterator], release: Callable[[], None]
+        ) -> tuple[str, AsyncIterator]:
+            return opened[0], _HeldStream(opened[1], release)
+
+        return await self._call(
+            first_chunk,
+            metrics,
+            model=chat_model.model_name,
+            tokens=self._request_tokens(messages),
+            kind="stream",
+            keep=hold,
+        )
+
+    def _join(
+        self,
+        key: tuple,
+        start: Callable[[_Flight], Awaitable[T]],
+        share: bool = True,
+    ) -> tuple[_Flight, bool]:
+        """Join the identical request in flight, or start it.
+
+        Returns the flight and whether this caller started it. With
+        ``share=False`` a new call is always started, though later callers
+        may still join it.
+        """
+        flight = self._flights.get(key)
+        # A flight its last caller left is still unwinding its cancellation
+        if (
+            share
+            and flight is not None
+            and flight.callers > 0
+            and not flight.task.done()
+            and not flight.task.cancelling()
+        ):
+            flight.callers += 1
+            return flight, False
+
+        flight = _Flight()
+        flight.callers = 1
+        flight.task = asyncio.create_task(start(flight))
+
+        def done(_: asyncio.Task) -> None:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.wake()
+
+        flight.task.add_done_callback(done)
+        self._flights[key] = flight
+        return flight, True
+
+    @staticmethod
+    def _leave(flight: _Flight) -> None:
+        """Leave a flight, cancelling its call if nobody is waiting any more."""
+        flight.callers -= 1
+        if flight.callers == 0 and not flight.task.done():
+            flight.task.cancel()
+
+    def _follower_metrics(
+        self, metrics: Optional[GenerationMetrics], streaming: bool
+    ) -> GenerationMetrics:
+        """Start the metrics of a caller that joined another caller's request."""
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.streaming = streaming
+        metrics.shared = True
+        metrics.start()
+        return metrics
+
+    async def _shared_call(
+        self,
+        key: tuple,
+        start: Callable[[_Flight], Awaitable[T]],
+        metrics: Optional[GenerationMetrics],
+        share: bool,
+    ) -> T:
+        """Run a non-streaming request, sharing it with identical ones."""
+        flight, leader = self._join(key, start, share)
+        follower = None if leader else self._follower_metrics(metrics, False)
+        error: Optional[BaseException] = None
+        try:
+            # Shielded so this caller leaving does not cancel the others
+            return await asyncio.shield(flight.task)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._leave(flight)
+            if follower is not None:
+                follower.finish(error)
+                self.metrics.record(follower)
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+        stop: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Generate content with streaming response.
+
+        A cached response is yielded as a single chunk. Pass
+        ``use_cache=False`` to force a fresh generation; its result still
+        replaces the cached entry. Failures before the first chunk are
+        retried; a stream that stalls for longer than the request timeout
+        after that raises ``LLMError``. Timings are recorded into ``metrics``,
+        created when the request was queued.
+
+        The response ends at ``stop``, which is not yielded. It is sent as a
+        stop sequence, and models that ignore it are cut off there, so the
+        response still completes and is cached.
+
+        Identical streams already in flight are joined rather than requested
+        again, and replay every chunk from the start.
+        """
+        messages = self._build_messages(system_prompt, user_input, max_sentences)
+        flight, leader = self._join(
+            self._flight_key(f"stream:{stop or ''}", messages),
+            lambda flight: self._stream_upstream(
+                messages, use_cache, metrics, flight, stop
+            ),
+            share=use_cache,
+        )
+        follower = None if leader else self._follower_metrics(metrics, True)
+        error: Optional[BaseException] = None
+        try:
+            async for chunk in flight.follow():
+                if follower is not None:
+                    follower.first_token()
+                yield chunk
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._leave(flight)
+            if follower is not None:
+                follower.finish(error)
+                self.metrics.record(follower)
+
+    async def _stream_upstream(
+        self,
+        messages: list,
+        use_cache: bool,
+        metrics: Optional[GenerationMetrics],
+        flight: _Flight,
+        stop: Optional[str] = None,
+    ) -> str:
+        """Stream one response, publishing its chunks to the flight."""
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.streaming = True
+        metrics.start()
+        error: Optional[BaseException] = None
         try:
-            async for chunk in self.client.astream(messages):
-                if chunk.content:
-                    yield str(chunk.content)
-        except Exception as e:
-            # Convert to LLMError for consistent error handling
-            raise LLMError(f"Failed to generate content: {e}") from e
+            key = self._cache_key(messages)
+            if use_cache and key is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    metrics.cached = True
+                    metrics.first_token()
+                    flight.publish(cached)
+                    return cached
+
+            async def close_stream(opened: tuple[str, AsyncIterator]) -> None:
+                await opened[1].aclose()
+
+            try:
+                first, stream = await self._hedge(
+                    lambda chat_model: self._open_stream(
+                        chat_model, messages, metrics, stop
+                    ),
+                    discard=close_stream,
+                    metrics=metrics,
+                )
+            except Exception as e:
+                # Convert to LLMError for consistent error handling
+                raise LLMError(f"Failed to generate content: {e}") from e
+
+            text = ""
+            # Text up to here has been published; the rest may start ``stop``
+            published = 0
+            ended = False
+
+            def add(content: str) -> None:
+                nonlocal text, published, ended
+                metrics.first_token()
+                text += content
+                if stop is not None:
+                    end = text.find(stop, max(0, published - len(stop)))
+                    if end >= 0:
+                        text = text[:end]
+                        ended = True
+                        return
+                held = _partial_suffix(text, stop)
+                if len(text) - held > published:
+                    flight.publish(text[published : len(text) - held])
+                    published = len(text) - held
+
+            try:
+                if first:
+                    add(first)
+                while not ended:
+                    try:
+                        async with asyncio.timeout(self.request_timeout):
+                            chunk = await stream.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    self._record_usage(metrics, chunk)
+                    if chunk.content:
+                        add(str(chunk.content))
+            except TimeoutError as e:
+                raise LLMError("Stream stalled, no data received in time") from e
+            except Exception as e:
+                raise LLMError(f"Stream interrupted: {e}") from e
+            finally:
+                await stream.aclose()
+
+            self._estimate_usage(metrics, messages, text)
+            self._settle(metrics, messages)
+            self._cache_result(key, metrics, text)
+            # Published last, with nothing awaited before the flight ends, so
+            # a caller that stops at the end of the text can't cancel it
+            if len(text) > published:
+                flight.publish(text[published:])
+            return text
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(error)
+            self.metrics.record(metrics)
 
     async def generate(
-        self, system_prompt: str, user_input: str, max_sentences: int = 3
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
     ) -> str:
-        """Generate content without streaming."""
-        full_prompt = (
-            f"{system_prompt}\n\nGenerate a post in exactly {max_sentences} sentences."
+        """Generate content without streaming.
+
+        Identical requests already in flight are joined rather than sent
+        again.
+        """
+        messages = self._build_messages(system_prompt, user_input, max_sentences)
+        return await self._shared_call(
+            self._flight_key("generate", messages),
+            lambda flight: self._generate_upstream(messages, use_cache, metrics),
+            metrics,
+            share=use_cache,
         )
-        messages = [
-            SystemMessage(content=full_prompt),
-            HumanMessage(content=user_input),
-        ]
 
-        response = await self.client.ainvoke(messages)
-        return str(response.content)
+    async def _generate_upstream(
+        self,
+        messages: list,
+        use_cache: bool,
+        metrics: Optional[GenerationMetrics],
+    ) -> str:
+        """Request one response without streaming."""
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.start()
+        error: Optional[BaseException] = None
+        try:
+            key = self._cache_key(messages)
+            if use_cache and key is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    metrics.cached = True
+                    return cached
+
+            try:
+                response = await self._hedge(
+                    lambda chat_model: self._call(
+                        lambda: chat_model.ainvoke(messages),
+                        metrics,
+                        model=chat_model.model_name,
+                        tokens=self._request_tokens(messages),
+                    ),
+                    metrics=metrics,
+                )
+            except Exception as e:
+                raise LLMError(f"Failed to generate content: {e}") from e
+            result = str(response.content)
+            self._record_usage(metrics, response)
+            self._estimate_usage(metrics, messages, result)
+            self._settle(metrics, messages)
+            self._cache_result(key, metrics, result)
+            return result
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(error)
+            self.metrics.record(metrics)
+
+    async def generate_candidates(
+        self,
+        system_prompt: str,
+        user_input: str,
+        count: int,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> list[str]:
+        """Generate ``count`` alternative posts in a single request.
+
+        Asks for ``count`` choices with the API's ``n`` parameter. Models
+        that ignore or reject ``n`` return fewer choices; the shortfall is
+        made up with parallel requests. The set is cached as a whole, and
+        identical requests already in flight are joined.
+        """
+        messages = self._build_messages(system_prompt, user_input, max_sentences)
+        candidates = await self._shared_call(
+            self._flight_key(f"candidates:{count}", messages),
+            lambda flight: self._candidates_upstream(
+                messages, count, use_cache, metrics
+            ),
+            metrics,
+            share=use_cache,
+        )
+        return list(candidates)
+
+    async def _candidates_upstream(
+        self,
+        messages: list,
+        count: int,
+        use_cache: bool,
+        metrics: Optional[GenerationMetrics],
+    ) -> list[str]:
+        """Request ``count`` choices, topping up with parallel requests."""
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.start()
+        error: Optional[BaseException] = None
+        try:
+            key = self._cache_key(messages, candidates=count)
+            if use_cache and key is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    metrics.cached = True
+                    return json.loads(cached)
+
+            async def request_choices(chat_model: ChatOpenAI) -> list[str]:
+                try:
+                    result = await self._call(
+                        lambda: chat_model.agenerate(
+                            [messages], stream=False, n=count
+                        ),
+                        metrics,
+                        model=chat_model.model_name,
+                        tokens=self._request_tokens(messages, outputs=count),
+                    )
+                except openai.BadRequestError as e:
+                    logger.debug("Model rejected n=%d: %s", count, e)
+                    return []
+                generations = result.generations[0]
+                if generations:
+                    self._record_usage(metrics, generations[0].message)
+                return [g.text for g in generations if g.text.strip()]
+
+            failures: list[Exception] = []
+            try:
+                candidates = await self._hedge(request_choices, metrics=metrics)
+                missing = count - len(candidates)
+                if missing > 0:
+                    chat_model = self._chat_model_for(metrics.model)
+                    extra = await asyncio.gather(
+                        *(
+                            self._call(
+                                lambda: chat_model.ainvoke(messages, stream=False),
+                                model=chat_model.model_name,
+                                tokens=self._request_tokens(messages),
+                            )
+                            for _ in range(missing)
+                        ),
+                        return_exceptions=True,
+                    )
+                    for response in extra:
+                        if isinstance(response, Exception):
+                            failures.append(response)
+                        elif str(response.content).strip():
+                            candidates.append(str(response.content))
+                    # Fewer candidates are fine, but not none at all
+                    if failures and not candidates:
+                        raise failures[0]
+                    for failure in failures:
+                        logger.debug("Extra candidate failed: %s", failure)
+            except Exception as e:
+                raise LLMError(f"Failed to generate content: {e}") from e
+            if not candidates:
+                raise LLMError("Failed to generate content: empty response")
+
+            self._estimate_usage(metrics, messages, "".join(candidates))
+            self._settle(metrics, messages, outputs=count)
+            # A set cut short by failures is worth asking for again
+            if not failures:
+                self._cache_result(key, metrics, json.dumps(candidates))
+            return candidates
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(error)
+            self.metrics.record(metrics)
+
+    @staticmethod
+    def _record_usage(metrics: GenerationMetrics, message) -> None:
+        """Copy token usage reported by the API into ``metrics``."""
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            metrics.tokens_in = usage.get("input_tokens", 0) or metrics.tokens_in
+            metrics.tokens_out = usage.get("output_tokens", 0) or metrics.tokens_out
+
+    @staticmethod
+    def _estimate_usage(
+        metrics: GenerationMetrics, messages: list, result: str
+    ) -> None:
+        """Estimate token usage the API did not report."""
+        if not metrics.tokens_in:
+            metrics.tokens_in = sum(
+                estimate_tokens(str(message.content)) for message in messages
+            )
+        if not metrics.tokens_out:
+            metrics.tokens_out = estimate_tokens(result)
+
+    @staticmethod
+    def _request_tokens(messages: list, outputs: int = 1) -> int:
+        """Estimate the tokens a request will use before sending it."""
+        prompt = sum(estimate_tokens(str(message.content)) for message in messages)
+        return prompt + outputs * EXPECTED_OUTPUT_TOKENS
+
+    def _settle(
+        self, metrics: GenerationMetrics, messages: list, outputs: int = 1
+    ) -> None:
+        """Correct the token budget reserved for a request by its real usage."""
+        get_limiter(metrics.model, self.pool_size).settle(
+            self._request_tokens(messages, outputs),
+            metrics.tokens_in + metrics.tokens_out,
+        )
+
+    def _flight_key(self, kind: str, messages: list) -> tuple:
+        """Get the key under which identical in-flight requests are shared."""
+        system_message, human_message = messages
+        return (kind, str(system_message.content), str(human_message.content))
+
+    def _cache_result(
+        self, key: Optional[str], metrics: GenerationMetrics, result: str
+    ) -> None:
+        """Cache a response, unless a fallback model answered for the primary.
+
+        Keys name the primary model, so a fallback's answer cached under one
+        would later be served as the primary's.
+        """
+        if key is not None and metrics.model == self.model:
+            self.cache.set(key, result)
+
+    def _cache_key(self, messages: list, candidates: int = 1) -> Optional[str]:
+        """Get the cache key for a request, or ``None`` if caching is off."""
+        if self.cache is None:
+            return None
+        system_message, human_message = messages
+        return ResponseCache.make_key(
+            self.model,
+            str(system_message.content),
+            str(human_message.content),
+            candidates,
+        )
+
+
+_shared_client: Optional[GenerationBackend] = None
+
+
+def get_shared_client(pool_size: Optional[int] = None) -> GenerationBackend:
+    """Get the process-wide client for the configured backend.
+
+    The TUI and batch mode share this instance so every generation reuses the
+    same warm connection pool and response cache. ``pool_size`` only applies
+    when the client is created.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = create_backend(pool_size=pool_size)
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """Close the process-wide client if it was created."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -0,0 +1,205 @@
+"""Per-generation latency and token metrics."""
+
+import json
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+
+from postman.config import config
+
+logger = logging.getLogger(__name__)
+
+MetricsListener = Callable[["GenerationMetrics"], None]
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate a token count when the API reports no usage."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def _sample_value(value: float) -> str:
+    """Format a Prometheus sample value in full, without exponents."""
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    # The shortest digits that round-trip, written out in positional form
+    return format(Decimal(repr(value)), "f")
+
+
+@dataclass
+class GenerationMetrics:
+    """Timings and token counts for one LLM call.
+
+    Created by the caller when the request is queued, filled in by
+    ``LLMClient`` and recorded when the call finishes.
+    """
+
+    label: str = ""
+    model: str = ""
+    streaming: bool = False
+    cached: bool = False
+    # Answered by joining an identical request that was already in flight
+    shared: bool = False
+    status: str = "ok"
+    error: Optional[str] = None
+    queue_time: float = 0.0
+    time_to_first_token: Optional[float] = None
+    latency: float = 0.0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    retries: int = 0
+    timestamp: float = field(default_factory=time.time)
+    queued_at: float = field(default_factory=time.monotonic, repr=False)
+    started_at: float = field(default=0.0, repr=False)
+
+    def start(self) -> None:
+        """Mark the end of queueing and the start of the call."""
+        self.started_at = time.monotonic()
+        self.queue_time = self.started_at - self.queued_at
+
+    def first_token(self) -> None:
+        """Mark the arrival of the first token, if not already marked."""
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.monotonic() - self.started_at
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Mark the end of the call, successful unless ``error`` is given."""
+        self.latency = time.monotonic() - self.started_at
+        if isinstance(error, Exception):
+            self.status = "error"
+            self.error = str(error)
+        elif error is not None:
+            # Cancelled, or the caller stopped reading the stream
+            self.status = "cancelled"
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Get output tokens per second after the first token arrived."""
+        generating = self.latency - (self.time_to_first_token or 0.0)
+        if self.tokens_out <= 0 or generating <= 0:
+            return None
+        return self.tokens_out / generating
+
+    def to_dict(self) -> Dict[str, object]:
+        """Get the exported fields as a dictionary."""
+        data = asdict(self)
+        del data["queued_at"], data["started_at"]
+        data["tokens_per_second"] = self.tokens_per_second
+        return data
+
+
+class MetricsRecorder:
+    """Keeps recent metrics in memory and appends them to local sinks.
+
+    ``jsonl_path`` receives one JSON line per call. ``prometheus_path`` is
+    rewritten with cumulative counters in the Prometheus textfile format, for
+    node_exporter's textfile collector.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Optional[Path] = None,
+        prometheus_path: Optional[Path] = None,
+        history: int = 200,
+    ):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.recent: Deque[GenerationMetrics] = deque(maxlen=history)
+        self._listeners: List[MetricsListener] = []
+        self._counters: Dict[tuple, float] = defaultdict(float)
+
+    @classmethod
+    def from_config(cls) -> "MetricsRecorder":
+        """Create a recorder writing to the configured sinks."""
+        return cls(config.metrics_path, config.metrics_prometheus_path)
+
+    def subscribe(self, listener: MetricsListener) -> None:
+        """Call ``listener`` with every recorded metric."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: MetricsListener) -> None:
+        """Stop calling ``listener``."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def record(self, metrics: GenerationMetrics) -> None:
+        """Record a finished call."""
+        self.recent.append(metrics)
+        self._count(metrics)
+        if config.debug:
+            logger.info("generation %s", json.dumps(metrics.to_dict()))
+        try:
+            self._write_jsonl(metrics)
+            self._write_prometheus()
+        except OSError as e:
+            logger.debug("Failed to write metrics: %s", e)
+        for listener in list(self._listeners):
+            listener(metrics)
+
+    def _count(self, metrics: GenerationMetrics) -> None:
+        model = metrics.model
+        self._counters[("postman_generations_total", model, metrics.status)] += 1
+        if metrics.cached:
+            self._counters[("postman_cache_hits_total", model, "")] += 1
+        if metrics.shared:
+            self._counters[("postman_shared_requests_total", model, "")] += 1
+        self._counters[("postman_generation_latency_seconds_sum", model, "")] += (
+            metrics.latency
+        )
+        self._counters[("postman_generation_latency_seconds_count", model, "")] += 1
+        if metrics.time_to_first_token is not None:
+            self._counters[
+                ("postman_time_to_first_token_seconds_sum", model, "")
+            ] += metrics.time_to_first_token
+            self._counters[
+                ("postman_time_to_first_token_seconds_count", model, "")
+            ] += 1
+        self._counters[("postman_queue_seconds_sum", model, "")] += metrics.queue_time
+        self._counters[("postman_tokens_total", model, "in")] += metrics.tokens_in
+        self._counters[("postman_tokens_total", model, "out")] += metrics.tokens_out
+        self._counters[("postman_retries_total", model, "")] += metrics.retries
+
+    def _write_jsonl(self, metrics: GenerationMetrics) -> None:
+        if self.jsonl_path is None:
+            return
+        self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(metrics.to_dict()) + "\n")
+
+    def _write_prometheus(self) -> None:
+        if self.prometheus_path is None:
+            return
+        lines = []
+        typed = set()
+        for (name, model, extra), value in sorted(self._counters.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            labels = f'model="{model}"'
+            if name == "postman_generations_total":
+                labels += f',status="{extra}"'
+            elif name == "postman_tokens_total":
+                labels += f',direction="{extra}"'
+            lines.append(f"{name}{{{labels}}} {_sample_value(value)}")
+
+        # Write atomically so the collector never reads a partial file
+        self.prometheus_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.prometheus_path.with_suffix(".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.prometheus_path)
+
+
+_recorder: Optional[MetricsRecorder] = None
+
+
+def get_recorder() -> MetricsRecorder:
+    """Get the process-wide metrics recorder."""
+    global _recorder
+    if _recorder is None:
+        _recorder = MetricsRecorder.from_config()
+    return _recorder
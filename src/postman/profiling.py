@@ -0,0 +1,251 @@
+"""Opt-in sampling profiler for whole Postman sessions.
+
+A background thread samples every thread's stack at a fixed interval. A
+probe scheduled on the event loop measures how late it runs, which is the
+loop's lag, and records where each waiting task is suspended. On exit the
+samples are written in the collapsed-stack format read by flamegraph.pl,
+speedscope and similar tools, with a summary of loop lag and time spent
+per handler next to it.
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Iterator, Optional
+
+from postman.config import config
+
+logger = logging.getLogger(__name__)
+
+# How often the event loop is probed for lag and waiting tasks, in seconds
+PROBE_INTERVAL = 0.1
+
+# Loop lag above which the interface visibly freezes, in seconds
+STALL_THRESHOLD = 0.1
+
+# Handlers listed in the summary
+TOP_HANDLERS = 20
+
+# Functions that call handlers: Textual's dispatch of messages, actions and
+# timers, its async workers, and asyncio's callback runner, which steps tasks
+_DISPATCHERS = {
+    ("textual._callback", "_invoke"),
+    ("textual.worker", "_run_async"),
+    ("asyncio.events", "_run"),
+}
+
+
+def _label(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}".replace(";", ",")
+
+
+def _stack(frame: Optional[FrameType]) -> list[FrameType]:
+    """Get the call stack ending at ``frame``, outermost first."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _awaiting(task: asyncio.Task) -> list[FrameType]:
+    """Get the chain of coroutines a waiting task is suspended in, outermost first.
+
+    ``Task.get_stack`` stops at the task's own coroutine, so follow what
+    each coroutine awaits instead.
+    """
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(
+            awaitable, "ag_frame", None
+        )
+        if frame is not None:
+            frames.append(frame)
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(
+            awaitable, "ag_await", None
+        )
+    return frames
+
+
+def _handler(frames: list[FrameType]) -> Optional[str]:
+    """Find the innermost function on a stack that a dispatcher called."""
+    for caller, frame in zip(reversed(frames[:-1]), reversed(frames[1:])):
+        name = (caller.f_globals.get("__name__"), caller.f_code.co_name)
+        if name in _DISPATCHERS:
+            return _label(frame)
+    return None
+
+
+class SessionProfiler:
+    """Samples stacks, event loop lag and handler time for a session.
+
+    Samples are taken in wall-clock time, so threads and tasks that wait
+    show up as well as those that compute. Handler time is estimated from
+    the samples of the event loop's thread, so handlers much shorter than
+    the interval only show up when they run often.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or config.profile_interval
+        self.samples: Counter[str] = Counter()
+        self.handlers: Counter[str] = Counter()
+        self.lags: list[float] = []
+        self.duration = 0.0
+        self._started = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread = threading.main_thread().ident
+        # When the probe now waiting on the loop was scheduled, if one is
+        self._probe_sent: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="postman-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stopped.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def watch(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Probe an event loop for lag and waiting tasks.
+
+        Defaults to the running loop, so call it from a coroutine or handler.
+        """
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._probe_sent = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        next_probe = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            self._sample(own)
+            now = time.perf_counter()
+            # Only one probe waits at a time, so a stall is one long lag
+            loop = self._loop
+            if loop is None or self._probe_sent is not None or now < next_probe:
+                continue
+            self._probe_sent = now
+            next_probe = now + PROBE_INTERVAL
+            try:
+                loop.call_soon_threadsafe(self._probe, now)
+            except RuntimeError:
+                # The loop has closed
+                self._loop = None
+
+    def _sample(self, own: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            frames = _stack(frame)
+            root = f"thread:{names.get(ident, ident)}"
+            stack = ";".join([root, *map(_label, frames)])
+            handler = _handler(frames) if ident == self._loop_thread else None
+            with self._lock:
+                self.samples[stack] += 1
+                if handler is not None:
+                    self.handlers[handler] += 1
+
+    def _probe(self, sent: float) -> None:
+        self.lags.append(time.perf_counter() - sent)
+        self._probe_sent = None
+        # Weighted so waiting time adds up like the thread samples
+        weight = max(1, round(PROBE_INTERVAL / self.interval))
+        waiting: Counter[str] = Counter()
+        for task in asyncio.all_tasks(self._loop):
+            frames = _awaiting(task)
+            if frames:
+                waiting[";".join(["waiting", *map(_label, frames)])] += weight
+        with self._lock:
+            self.samples.update(waiting)
+
+    def summary(self) -> str:
+        """Summarize the session's loop lag and busiest handlers."""
+        lines = [
+            f"Session of {self.duration:.1f}s sampled every "
+            f"{self.interval * 1000:g}ms"
+        ]
+        if self.lags:
+            lags = sorted(self.lags)
+            p95 = lags[int(0.95 * (len(lags) - 1))]
+            stalls = sum(lag > STALL_THRESHOLD for lag in lags)
+            lines.append(
+                f"Event loop lag: mean {statistics.fmean(lags) * 1000:.1f}ms, "
+                f"p95 {p95 * 1000:.1f}ms, max {lags[-1] * 1000:.1f}ms, "
+                f"{stalls} stalls over {STALL_THRESHOLD * 1000:g}ms"
+            )
+        else:
+            lines.append("Event loop lag: not measured")
+        lines.append("Time in handlers:")
+        with self._lock:
+            busiest = self.handlers.most_common(TOP_HANDLERS)
+        for handler, count in busiest:
+            lines.append(f"{count * self.interval * 1000:10.0f}ms  {handler}")
+        if not busiest:
+            lines.append("  none sampled")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Path) -> Path:
+        """Write the collapsed stacks and the summary; return the stacks' path."""
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"postman-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        with self._lock:
+            samples = sorted(self.samples.items())
+        lines = [f"{stack} {count}" for stack, count in samples]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        path.with_suffix(".txt").write_text(self.summary(), encoding="utf-8")
+        return path
+
+
+# The profiler of the running session, if profiling is enabled
+_active: Optional[SessionProfiler] = None
+
+
+def watch_loop() -> None:
+    """Have the session profiler, if any, probe the running event loop."""
+    if _active is not None:
+        _active.watch()
+
+
+@contextmanager
+def profile_session() -> Iterator[Optional[SessionProfiler]]:
+    """Profile the enclosed code if ``POSTMAN_PROFILE`` is enabled.
+
+    The profile is written when the block exits, however it exits.
+    """
+    global _active
+    if not config.profile:
+        yield None
+        return
+    profiler = SessionProfiler()
+    _active = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        _active = None
+        profiler.stop()
+        try:
+            path = profiler.write(config.profile_path)
+        except OSError as e:
+            logger.warning("Could not write the session profile: %s", e)
+        else:
+            print(f"Profile written to {path}", file=sys.stderr)
@@ -1,7 +1,25 @@
 """Platform-specific prompt templates for social media posts."""
 
+import re
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict
+from typing import Dict, List, Mapping, Optional
+
+# Event form fields that go into every generation request
+EVENT_FIELDS = ("title", "date", "time", "location", "description")
+
+
+# Parses the output of ``build_event_context`` and
+# ``build_multi_platform_context``
+_EVENT_CONTEXT = re.compile(
+    r"Title: (?P<title>[^\n]*)\n"
+    r"Date: (?P<date>[^\n]*)\n"
+    r"Time: (?P<time>[^\n]*)\n"
+    r"Location: (?P<location>[^\n]*)\n"
+    r"Description: (?P<description>.*)\n\n"
+    r"Platforms?: (?P<platforms>[^\n]*)",
+    re.DOTALL,
+)
 
 
 class Platform(Enum):
@@ -13,6 +31,17 @@ class Platform(Enum):
     INSTAGRAM = "instagram"
 
 
+@dataclass(frozen=True)
+class FormatRules:
+    """The machine-checkable parts of a platform's FORMAT REQUIREMENTS."""
+
+    max_chars: Optional[int]
+    min_hashtags: int
+    max_hashtags: int
+    # One "• date | time | location" line instead of labelled bullets
+    compact_details: bool = False
+
+
 class PromptManager:
     """Manages platform-specific system prompts."""
 
@@ -140,11 +169,68 @@ Who's coming? Drop a 🙋 below!
 #Python #HKPUG #Coding #TechCommunity #HongKong #Programming #LearnToCode #DeveloperLife #PythonProgramming #TechEvent""",
     }
 
+    # Limits stated in, or implied by, the prompts above
+    FORMAT_RULES: Dict[Platform, FormatRules] = {
+        Platform.LINKEDIN: FormatRules(max_chars=3000, min_hashtags=2, max_hashtags=5),
+        Platform.FACEBOOK: FormatRules(max_chars=2000, min_hashtags=1, max_hashtags=5),
+        Platform.TWITTER: FormatRules(
+            max_chars=280, min_hashtags=2, max_hashtags=3, compact_details=True
+        ),
+        Platform.INSTAGRAM: FormatRules(
+            max_chars=2200, min_hashtags=5, max_hashtags=10
+        ),
+    }
+
+    # Fields of each platform's FORMAT REQUIREMENTS, in order, as written
+    # in structured output mode
+    STRUCTURED_FIELDS: Dict[Platform, tuple[str, ...]] = {
+        Platform.LINKEDIN: ("body", "details", "hashtags"),
+        Platform.FACEBOOK: ("body", "details", "hashtags"),
+        Platform.TWITTER: ("body", "details", "hashtags"),
+        Platform.INSTAGRAM: ("hook", "body", "details", "question", "hashtags"),
+    }
+
+    FIELD_DESCRIPTIONS: Dict[str, str] = {
+        "hook": "the attention-grabbing hook",
+        "body": "the main text",
+        "details": "the event details in bullet format",
+        "question": "the engagement question",
+        "hashtags": "the hashtags",
+    }
+
     @classmethod
     def get_prompt(cls, platform: Platform) -> str:
         """Get system prompt for a specific platform."""
         return cls.PROMPTS.get(platform, cls.PROMPTS[Platform.LINKEDIN])
 
+    @classmethod
+    def get_structured_fields(cls, platform: Platform) -> tuple[str, ...]:
+        """Get the fields a platform's posts are written as in structured mode."""
+        return cls.STRUCTURED_FIELDS.get(
+            platform, cls.STRUCTURED_FIELDS[Platform.LINKEDIN]
+        )
+
+    @classmethod
+    def get_structured_prompt(cls, platform: Platform) -> str:
+        """Get a system prompt asking for the post's fields under markers."""
+        markers = "\n".join(
+            f"[{field.upper()}] {cls.FIELD_DESCRIPTIONS[field]}"
+            for field in cls.get_structured_fields(platform)
+        )
+        return f"""{cls.get_prompt(platform)}
+
+OUTPUT MARKERS:
+Write each part of the post on the lines after its marker, in this order:
+{markers}
+[END]
+Put every marker on a line of its own and finish with [END]. Write nothing before the \
+first marker or after [END]."""
+
+    @classmethod
+    def get_format_rules(cls, platform: Platform) -> FormatRules:
+        """Get the format rules a platform's posts are checked against."""
+        return cls.FORMAT_RULES.get(platform, cls.FORMAT_RULES[Platform.LINKEDIN])
+
     @classmethod
     def build_event_context(
         cls,
@@ -168,6 +254,127 @@ Platform: {platform.value}
 """
         return context
 
+    @classmethod
+    def parse_event_context(
+        cls, context: str
+    ) -> tuple[Dict[str, str], List[Platform]]:
+        """Recover the event fields and platforms from a built event context."""
+        match = _EVENT_CONTEXT.search(context)
+        if match is None:
+            return {}, []
+        fields = {field: match.group(field) for field in EVENT_FIELDS}
+        values = {platform.value for platform in Platform}
+        platforms = [
+            Platform(name.strip())
+            for name in match.group("platforms").split(",")
+            if name.strip() in values
+        ]
+        return fields, platforms
+
+    @classmethod
+    def get_multi_platform_prompt(cls, platforms: List[Platform]) -> str:
+        """Get a system prompt asking for every platform in one JSON response."""
+        keys = ", ".join(f'"{platform.value}"' for platform in platforms)
+        sections = "\n\n".join(
+            f"=== {platform.value} ===\n{cls.get_prompt(platform)}"
+            for platform in platforms
+        )
+        return f"""You write social media posts for the Hong Kong Python User Group \
+for several platforms at once.
+
+Follow each platform's instructions below for that platform's post.
+
+{sections}
+
+OUTPUT FORMAT:
+Respond with a single JSON object and nothing else. Use exactly these keys: {keys}.
+Each value is the complete post for that platform as a string, following that \
+platform's FORMAT REQUIREMENTS. Use \\n for line breaks inside the strings."""
+
+    @classmethod
+    def build_multi_platform_context(
+        cls,
+        title: str,
+        date: str,
+        time: str,
+        location: str,
+        description: str,
+        platforms: List[Platform],
+    ) -> str:
+        """Build user input with event context for several platforms."""
+        context = f"""Create social media posts for the following event:
+
+Title: {title}
+Date: {date}
+Time: {time}
+Location: {location}
+Description: {description}
+
+Platforms: {", ".join(platform.value for platform in platforms)}
+"""
+        return context
+
+    # Asks for a minimal fix to a post that broke its format rules
+    REPAIR_PROMPT = """You fix social media posts for the Hong Kong Python User Group \
+that break their platform's format rules.
+
+Change only what is needed to fix the listed problems and keep everything else exactly \
+as written.
+Respond with the corrected post only, without any commentary."""
+
+    @classmethod
+    def get_repair_prompt(cls) -> str:
+        """Get the system prompt for repairing a post's format."""
+        return cls.REPAIR_PROMPT
+
+    @classmethod
+    def build_repair_context(
+        cls, post: str, problems: List[str], platform: Platform
+    ) -> str:
+        """Build user input listing a post's format problems."""
+        listed = "\n".join(f"- {problem}" for problem in problems)
+        context = f"""Fix this {platform.value} post.
+
+Problems:
+{listed}
+
+Post:
+{post}
+"""
+        return context
+
+    SEED_PROMPT = """You write social media posts for the Hong Kong Python User Group \
+by adapting a post written for an earlier edition of the same event.
+
+Keep the previous post's structure, tone, emojis and hashtags. Update every event \
+detail to match the new event exactly, and rewrite anything the new description \
+contradicts.
+Respond with the new post only, without any commentary."""
+
+    @classmethod
+    def get_seed_prompt(cls) -> str:
+        """Get the system prompt for adapting a past post to a new event."""
+        return cls.SEED_PROMPT
+
+    @classmethod
+    def build_seed_context(
+        cls, previous_post: str, fields: Mapping[str, str], platform: Platform
+    ) -> str:
+        """Build user input pairing a past post with the new event's context."""
+        event = cls.build_event_context(
+            title=fields.get("title", ""),
+            date=fields.get("date", ""),
+            time=fields.get("time", ""),
+            location=fields.get("location", ""),
+            description=fields.get("description", ""),
+            platform=platform,
+        )
+        context = f"""Previous post:
+{previous_post}
+
+{event}"""
+        return context
+
     @classmethod
     def get_content_constraint(cls, platform: Platform) -> str:
         """Get content length constraint for platform."""
@@ -0,0 +1,83 @@
+"""Cheap local scoring of generated posts against platform format rules."""
+
+import re
+from typing import Iterable
+
+from postman.prompts import Platform, PromptManager
+
+HASHTAG = re.compile(r"(?<!\w)#\w+")
+
+# Labelled event detail bullets required by the long-form prompts, in order
+DETAIL_LABELS = ("Date", "Time", "Location")
+
+_BULLET = re.compile(r"^\s*[•\-*]\s*(.*)$", re.MULTILINE)
+
+
+def hashtags(text: str) -> list[str]:
+    """Get the hashtags in a post, in order."""
+    return HASHTAG.findall(text)
+
+
+def detail_bullets(text: str) -> list[str]:
+    """Get the text of each bullet line in a post."""
+    return [match.group(1).strip() for match in _BULLET.finditer(text)]
+
+
+def length_score(text: str, platform: Platform) -> float:
+    """Score how well a post fits the platform's length limit, from 0 to 1.
+
+    Posts within the limit score 1; going 10% over scores 0.
+    """
+    max_chars = PromptManager.get_format_rules(platform).max_chars
+    if max_chars is None or len(text) <= max_chars:
+        return 1.0
+    overflow = (len(text) - max_chars) / max_chars
+    return max(0.0, 1.0 - 10 * overflow)
+
+
+def details_score(text: str, platform: Platform) -> float:
+    """Score the fraction of required event detail bullets present."""
+    bullets = detail_bullets(text)
+    if PromptManager.get_format_rules(platform).compact_details:
+        parts = max((len(bullet.split("|")) for bullet in bullets), default=0)
+        return min(parts, len(DETAIL_LABELS)) / len(DETAIL_LABELS)
+    present = sum(
+        any(bullet.lower().startswith(f"{label.lower()}:") for bullet in bullets)
+        for label in DETAIL_LABELS
+    )
+    return present / len(DETAIL_LABELS)
+
+
+def hashtag_score(text: str, platform: Platform) -> float:
+    """Score the hashtag count against the platform's allowed range."""
+    rules = PromptManager.get_format_rules(platform)
+    count = len(hashtags(text))
+    if rules.min_hashtags <= count <= rules.max_hashtags:
+        return 1.0
+    distance = (
+        rules.min_hashtags - count
+        if count < rules.min_hashtags
+        else count - rules.max_hashtags
+    )
+    return max(0.0, 1.0 - distance / max(1, rules.max_hashtags))
+
+
+def score_post(text: str, platform: Platform) -> float:
+    """Score a post against the platform's format rules, from 0 to 3."""
+    if not text.strip():
+        return 0.0
+    return (
+        length_score(text, platform)
+        + details_score(text, platform)
+        + hashtag_score(text, platform)
+    )
+
+
+def rank_candidates(candidates: Iterable[str], platform: Platform) -> list[str]:
+    """Order alternative posts best first, dropping duplicates.
+
+    Ties keep the order the model returned them in.
+    """
+    unique = list(dict.fromkeys(candidate.strip() for candidate in candidates))
+    unique = [candidate for candidate in unique if candidate]
+    return sorted(unique, key=lambda text: score_post(text, platform), reverse=True)
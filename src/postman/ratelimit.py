@@ -0,0 +1,248 @@
+"""Client-side rate limiting and adaptive concurrency for LLM requests."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Optional
+
+import openai
+
+from postman.config import config
+from postman.resilience import retry_after
+
+logger = logging.getLogger(__name__)
+
+# Output tokens reserved per request before the real count is known
+EXPECTED_OUTPUT_TOKENS = 300
+
+# Multiplicative decreases for rate limiting and for latency spikes
+OVERLOAD_BACKOFF = 0.5
+LATENCY_BACKOFF = 0.8
+
+# A latency this many times the healthy baseline counts as a spike
+LATENCY_TOLERANCE = 2.0
+
+
+class TokenBucket:
+    """Budget refilled continuously at ``per_minute`` units per minute.
+
+    Holds at most one minute's budget, so an idle client can burst up to the
+    provider's limit but never beyond it.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` is available and take it."""
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.available >= amount:
+                self.available -= amount
+                return
+            await asyncio.sleep((amount - self.available) / self.rate)
+
+    def charge(self, amount: float) -> None:
+        """Correct the budget once the real cost is known; may go negative."""
+        self._refill()
+        self.available = min(self.capacity, self.available - amount)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on the number of requests in flight.
+
+    Every healthy response raises the limit by ``1 / limit``, about one per
+    round of requests. Rate limiting halves it and latency spikes trim it,
+    at most once per baseline latency so a burst of failures from the same
+    round only counts once. Each kind of request keeps its own baseline, as
+    a stream's time to first token can't be compared with a full response.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self.baselines: Dict[str, float] = {}
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Woken just as it was cancelled; pass the slot on
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        """Give a slot back."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self, latency: float, kind: str = "request") -> None:
+        """Ramp up after a healthy response, or back off on a latency spike."""
+        baseline = self.baselines.get(kind)
+        if baseline is not None and latency > baseline * LATENCY_TOLERANCE:
+            self._decrease(LATENCY_BACKOFF)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+        # Follow slow drifts in latency, such as longer posts
+        if baseline is None:
+            self.baselines[kind] = latency
+        else:
+            self.baselines[kind] = baseline + 0.1 * (latency - baseline)
+
+    def on_overload(self) -> None:
+        """Back off after the provider rate limited or timed out a request."""
+        self._decrease(OVERLOAD_BACKOFF)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < max(1.0, *self.baselines.values()):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * factor)
+        logger.debug("Concurrency limit lowered to %.1f", self.limit)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Check if an error is the provider rate limiting us."""
+    return isinstance(error, openai.APIStatusError) and error.status_code == 429
+
+
+class RateLimiter:
+    """Request and token budgets plus adaptive concurrency for one model.
+
+    A zero budget is unlimited. A 429 with ``Retry-After`` pauses every
+    request to the model, not just the one that was refused, so callers
+    don't keep hitting the limit while each waits out its own backoff.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_concurrency: int = 4,
+        adaptive: bool = True,
+    ):
+        self.requests: Optional[TokenBucket] = None
+        if requests_per_minute > 0:
+            self.requests = TokenBucket(requests_per_minute)
+        self.tokens: Optional[TokenBucket] = None
+        if tokens_per_minute > 0:
+            self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency: Optional[AdaptiveConcurrency] = None
+        if adaptive:
+            self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self._paused_until = 0.0
+
+    async def _wait_for_pause(self) -> None:
+        while (delay := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(
+        self, tokens: int = 0, kind: str = "request", hold: bool = False
+    ) -> AsyncIterator[Callable[[], None]]:
+        """Hold a slot for one request attempt expected to use ``tokens``.
+
+        Latency is tracked per ``kind`` of request. With ``hold``, a
+        successful attempt keeps its concurrency slot after the block until
+        the function it yields is called, such as when a stream is closed.
+        """
+        await self._wait_for_pause()
+        if self.concurrency is not None:
+            await self.concurrency.acquire()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released and self.concurrency is not None:
+                released = True
+                self.concurrency.release()
+
+        succeeded = False
+        try:
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None and tokens:
+                await self.tokens.acquire(tokens)
+            started = time.monotonic()
+            try:
+                yield release
+            except Exception as e:
+                self._record_failure(e)
+                raise
+            succeeded = True
+            if self.concurrency is not None:
+                self.concurrency.on_success(time.monotonic() - started, kind)
+        finally:
+            if not (hold and succeeded):
+                release()
+
+    def _record_failure(self, error: Exception) -> None:
+        if is_rate_limited(error):
+            delay = retry_after(error)
+            if delay:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        elif not isinstance(error, TimeoutError):
+            return
+        if self.concurrency is not None:
+            self.concurrency.on_overload()
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Charge the difference between reserved and actual tokens."""
+        if self.tokens is not None:
+            self.tokens.charge(actual - estimated)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_limiter(model: str, max_concurrency: int) -> RateLimiter:
+    """Get the process-wide limiter for a model, creating it on first use.
+
+    Limiters are shared by every client, so the TUI and batch workers draw
+    on the same budgets. ``max_concurrency`` only applies on creation.
+    """
+    if model not in _limiters:
+        requests_per_minute, tokens_per_minute = config.rate_limit(model)
+        _limiters[model] = RateLimiter(
+            requests_per_minute,
+            tokens_per_minute,
+            max_concurrency,
+            adaptive=config.adaptive_concurrency,
+        )
+    return _limiters[model]
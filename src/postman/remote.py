@@ -0,0 +1,218 @@
+"""Generation backend that forwards requests to a ``postman serve`` instance."""
+
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from postman.config import config
+from postman.llm import LLMError
+from postman.metrics import GenerationMetrics, MetricsRecorder, get_recorder
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteBackend:
+    """Backend served by a shared Postman server.
+
+    Prompts are built, validated and ranked locally as usual; only the LLM
+    calls go to the server, which shares its connections, cache and rate
+    limits between every client.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        metrics: Optional[MetricsRecorder] = None,
+    ):
+        self.base_url = (base_url or config.remote_url).rstrip("/")
+        self.model = "remote"
+        self.metrics = metrics or get_recorder()
+        token = config.serve_token if token is None else token
+        pool_size = pool_size or config.pool_size
+        # The server retries upstream failures itself before answering
+        timeout = config.request_timeout * (config.max_retries + 2)
+        self.http_client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {token}"} if token else {},
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    @staticmethod
+    def _payload(
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int],
+        use_cache: bool,
+        metrics: GenerationMetrics,
+        count: int = 1,
+        stop: Optional[str] = None,
+    ) -> dict:
+        return {
+            "system_prompt": system_prompt,
+            "user_input": user_input,
+            "max_sentences": max_sentences,
+            "use_cache": use_cache,
+            "count": count,
+            "stop": stop,
+            "label": metrics.label,
+        }
+
+    def _update_metrics(self, metrics: GenerationMetrics, reply: dict) -> None:
+        """Copy what the server reported about a generation into ``metrics``."""
+        metrics.model = reply.get("model") or self.model
+        metrics.cached = bool(reply.get("cached"))
+        metrics.shared = bool(reply.get("shared"))
+        metrics.tokens_in = int(reply.get("tokens_in") or 0)
+        metrics.tokens_out = int(reply.get("tokens_out") or 0)
+        metrics.retries = int(reply.get("retries") or 0)
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        try:
+            response = await self.http_client.post(path, json=payload)
+        except httpx.HTTPError as e:
+            raise LLMError(
+                f"Cannot reach Postman server at {self.base_url}: {e}"
+            ) from e
+        try:
+            reply = response.json()
+        except json.JSONDecodeError:
+            reply = {}
+        if response.status_code != 200:
+            message = reply.get("error") or response.reason_phrase
+            raise LLMError(f"Postman server error: {message}")
+        return reply
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> str:
+        """Generate a post on the server."""
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.start()
+        error: Optional[BaseException] = None
+        try:
+            reply = await self._post(
+                "/v1/generate",
+                self._payload(
+                    system_prompt, user_input, max_sentences, use_cache, metrics
+                ),
+            )
+            self._update_metrics(metrics, reply)
+            metrics.first_token()
+            return str(reply.get("output", ""))
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(error)
+            self.metrics.record(metrics)
+
+    async def generate_stream(
+        self,
+        system_prompt: str,
+        user_input: str,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+        stop: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Stream a post from the server as it is generated."""
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.streaming = True
+        metrics.start()
+        payload = self._payload(
+            system_prompt, user_input, max_sentences, use_cache, metrics, stop=stop
+        )
+        error: Optional[BaseException] = None
+        try:
+            try:
+                async with self.http_client.stream(
+                    "POST", "/v1/stream", json=payload
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        try:
+                            message = response.json().get("error")
+                        except json.JSONDecodeError:
+                            message = response.reason_phrase
+                        raise LLMError(f"Postman server error: {message}")
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data: "):
+                            continue
+                        event = json.loads(line[len("data: ") :])
+                        if "chunk" in event:
+                            metrics.first_token()
+                            yield event["chunk"]
+                        elif "error" in event:
+                            raise LLMError(event["error"])
+                        elif event.get("done"):
+                            self._update_metrics(metrics, event)
+                            return
+            except httpx.HTTPError as e:
+                raise LLMError(f"Stream from Postman server interrupted: {e}") from e
+            raise LLMError("Stream from Postman server ended early")
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(error)
+            self.metrics.record(metrics)
+
+    async def generate_candidates(
+        self,
+        system_prompt: str,
+        user_input: str,
+        count: int,
+        max_sentences: Optional[int] = 3,
+        use_cache: bool = True,
+        metrics: Optional[GenerationMetrics] = None,
+    ) -> list[str]:
+        """Generate alternative posts on the server."""
+        metrics = metrics or GenerationMetrics()
+        metrics.model = self.model
+        metrics.start()
+        error: Optional[BaseException] = None
+        try:
+            reply = await self._post(
+                "/v1/candidates",
+                self._payload(
+                    system_prompt, user_input, max_sentences, use_cache, metrics, count
+                ),
+            )
+            self._update_metrics(metrics, reply)
+            metrics.first_token()
+            return [str(output) for output in reply.get("outputs", [])]
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(error)
+            self.metrics.record(metrics)
+
+    async def warm_up(self) -> None:
+        """Connect to the server and learn which model it uses.
+
+        Failures are ignored; the first real request will report them.
+        """
+        try:
+            response = await self.http_client.get("/health")
+            self.model = response.json().get("model") or self.model
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            logger.debug("Postman server warm-up failed: %s", e)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.http_client.aclose()
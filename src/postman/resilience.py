@@ -0,0 +1,184 @@
+"""Retry, timeout and circuit-breaker policy for LLM requests."""
+
+import asyncio
+import email.utils
+import logging
+import time
+from typing import Optional
+
+import httpx
+import openai
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and 5xx
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Longest we are willing to sleep between attempts, including Retry-After
+MAX_RETRY_WAIT = 10.0
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is rejecting calls."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(
+            f"OpenRouter looks unavailable, not retrying for {retry_in:.0f}s"
+        )
+        self.retry_in = retry_in
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check if an error is a transient transport or HTTP failure."""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, (httpx.TransportError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS
+    return False
+
+
+def is_outage(error: BaseException) -> bool:
+    """Check if an error suggests the upstream is down rather than busy."""
+    if isinstance(error, openai.APIStatusError) and error.status_code == 429:
+        return False
+    return is_retryable(error)
+
+
+def retry_after(error: Optional[BaseException]) -> Optional[float]:
+    """Get the delay requested by a ``Retry-After`` header, in seconds."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class wait_retry_after(wait_base):
+    """Wait for the server's ``Retry-After`` if given, else use ``fallback``."""
+
+    def __init__(self, fallback: wait_base):
+        self.fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after(error)
+        if delay is not None:
+            return delay
+        return self.fallback(retry_state)
+
+
+class stop_on_long_retry_after(stop_base):
+    """Give up when the server asks us to wait longer than ``max_wait``."""
+
+    def __init__(self, max_wait: float):
+        self.max_wait = max_wait
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after(error)
+        return delay is not None and delay > self.max_wait
+
+
+def retrying(max_retries: int) -> AsyncRetrying:
+    """Build the retry policy for one logical request."""
+    return AsyncRetrying(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(max_retries + 1)
+        | stop_on_long_retry_after(MAX_RETRY_WAIT),
+        wait=wait_retry_after(wait_exponential_jitter(initial=1, max=MAX_RETRY_WAIT)),
+        reraise=True,
+    )
+
+
+class CircuitBreaker:
+    """Fails fast after repeated upstream outages.
+
+    After ``failure_threshold`` consecutive outage errors the breaker opens
+    and rejects calls for ``reset_timeout`` seconds. It then lets a single
+    trial call through; success closes it again, failure re-opens it. Only
+    the trial call itself frees the trial slot.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Check if calls are currently being rejected."""
+        return self._opened_at is not None
+
+    def before_call(self) -> bool:
+        """Raise ``CircuitOpenError`` if the call should not be attempted.
+
+        Returns whether the call is the half-open trial, which must be passed
+        back to ``record_failure`` or ``release``.
+        """
+        if self._opened_at is None:
+            return False
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if remaining > 0 or self._trial_in_flight:
+            raise CircuitOpenError(max(remaining, 0.0))
+        # Half-open: let one trial call through
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful call and close the breaker."""
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release(self, trial: bool) -> None:
+        """Release the trial slot if a cancelled call was the trial."""
+        if trial:
+            self._trial_in_flight = False
+
+    def record_failure(self, error: BaseException, trial: bool = False) -> None:
+        """Record a failed call, opening the breaker on repeated outages."""
+        if not is_outage(error):
+            # The upstream answered, so it is up
+            self.record_success()
+            return
+        if trial:
+            self._trial_in_flight = False
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    "Opening circuit after %d consecutive failures", self._failures
+                )
+            self._opened_at = time.monotonic()
@@ -0,0 +1,288 @@
+"""Review screen for large numbers of generated posts."""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+import pyperclip
+from rich.text import Text
+from textual.app import App, ComposeResult
+from textual.containers import Horizontal, VerticalScroll
+from textual.screen import Screen
+from textual.timer import Timer
+from textual.widgets import DataTable, Footer, Header, Input, Label, Static
+
+from postman.history import HistoryEntry, PostHistory
+from postman.profiling import watch_loop
+from postman.prompts import Platform
+
+# Characters of each post shown in the table; the rest is in the detail pane
+PREVIEW_CHARS = 60
+
+# Seconds the cursor must rest on a row before its post is rendered, so
+# scrolling through hundreds of rows doesn't render every post on the way
+DETAIL_DELAY = 0.05
+
+STATUS_FILTERS = ("all", "ok", "failed")
+
+
+def load_results(path: Path) -> list[dict]:
+    """Load the records of a batch output file.
+
+    A resumed run appends a new record for every retried job, so only the
+    latest record for each event and platform is kept.
+    """
+    records: dict[tuple, dict] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted write
+                continue
+            if isinstance(record, dict):
+                key = (record.get("id"), record.get("platform"))
+                records.pop(key, None)
+                records[key] = record
+    return list(records.values())
+
+
+def result_status(record: dict) -> str:
+    """Get whether a result record succeeded or failed."""
+    return "failed" if record.get("error") else "ok"
+
+
+def preview(text: str, width: int = PREVIEW_CHARS) -> str:
+    """Get the first line of a post, cut to ``width`` characters."""
+    line = next((line.strip() for line in text.split("\n") if line.strip()), "")
+    if len(line) > width:
+        return line[: width - 1].rstrip() + "…"
+    return line
+
+
+class ResultsScreen(Screen[None]):
+    """Table of generated posts with a detail pane for the selected one.
+
+    The table only renders the rows on screen, and a post's full text is
+    rendered once the cursor rests on it, so the view stays responsive
+    with hundreds of results.
+    """
+
+    DEFAULT_CSS = """
+    #results-search {
+        height: 3;
+    }
+
+    #results-summary {
+        height: auto;
+        padding: 0 1;
+    }
+
+    #results-body {
+        height: 1fr;
+    }
+
+    #results-table {
+        width: 3fr;
+        height: 100%;
+    }
+
+    #result-scroll {
+        width: 2fr;
+        height: 100%;
+        padding: 0 1;
+    }
+    """
+
+    BINDINGS = [
+        ("escape", "dismiss", "Back"),
+        ("b", "dismiss", "Back"),
+        ("/", "focus_search", "Search"),
+        ("p", "cycle_platform", "Platform"),
+        ("f", "cycle_status", "Status"),
+        ("c", "copy", "Copy"),
+    ]
+
+    def __init__(self, records: list[dict], **kwargs):
+        super().__init__(**kwargs)
+        self.records = records
+        self.platform_filter: Optional[str] = None
+        self.status_filter = "all"
+        self.query_text = ""
+        self._detail_timer: Optional[Timer] = None
+        self._selected: Optional[int] = None
+
+    def compose(self) -> ComposeResult:
+        yield Header(show_clock=True)
+        yield Input(placeholder="Search posts", id="results-search")
+        yield Label(id="results-summary")
+        with Horizontal(id="results-body"):
+            yield DataTable(id="results-table", cursor_type="row", zebra_stripes=True)
+            with VerticalScroll(id="result-scroll"):
+                yield Static(id="result-detail")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one("#results-table", DataTable)
+        table.add_columns("Event", "Platform", "#", "Status", "Chars", "Preview")
+        self.apply_filters()
+        table.focus()
+
+    def action_dismiss(self) -> None:
+        self.dismiss()
+
+    def action_focus_search(self) -> None:
+        self.query_one("#results-search", Input).focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        # Keep search edits away from the app's form handlers
+        event.stop()
+        self.search(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        self.query_one("#results-table", DataTable).focus()
+
+    def search(self, query: str) -> None:
+        """Show only results containing every word of ``query``."""
+        self.query_text = query
+        self.apply_filters()
+
+    def _matches(self, record: dict) -> bool:
+        if self.platform_filter and record.get("platform") != self.platform_filter:
+            return False
+        if self.status_filter not in ("all", result_status(record)):
+            return False
+        text = f"{record.get('title', '')} {record.get('output', '')}".lower()
+        return all(word in text for word in self.query_text.lower().split())
+
+    def apply_filters(self) -> None:
+        """Rebuild the table from the records matching the current filters."""
+        table = self.query_one("#results-table", DataTable)
+        table.clear()
+        rows = []
+        for index, record in enumerate(self.records):
+            if not self._matches(record):
+                continue
+            text = record.get("error") or record.get("output", "")
+            rows.append(
+                (
+                    str(record.get("title") or record.get("id", "")),
+                    str(record.get("platform", "")).title(),
+                    str(record.get("candidate", "")),
+                    result_status(record),
+                    str(len(record.get("output", ""))),
+                    preview(text),
+                )
+            )
+            table.add_row(*rows[-1], key=str(index))
+        self.query_one("#results-summary", Label).update(
+            f"Showing {len(rows)} of {len(self.records)} · "
+            f"platform: {self.platform_filter or 'all'} · "
+            f"status: {self.status_filter}"
+        )
+        if not rows:
+            self._selected = None
+            self.query_one("#result-detail", Static).update("No matching results.")
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if event.row_key.value is None:
+            return
+        self._selected = int(event.row_key.value)
+        if self._detail_timer is not None:
+            self._detail_timer.stop()
+        self._detail_timer = self.set_timer(DETAIL_DELAY, self._show_detail)
+
+    def _show_detail(self) -> None:
+        """Render the full text of the selected result."""
+        self._detail_timer = None
+        if self._selected is None:
+            return
+        record = self.records[self._selected]
+        if record.get("error"):
+            detail = Text(f"Failed: {record['error']}", style="red")
+        else:
+            detail = Text(record.get("output", ""))
+        self.query_one("#result-detail", Static).update(detail)
+        self.query_one("#result-scroll", VerticalScroll).scroll_home(animate=False)
+
+    def action_cycle_platform(self) -> None:
+        """Show only the next platform's results, then all of them again."""
+        options: list[Optional[str]] = [None]
+        options += [platform.value for platform in Platform]
+        position = options.index(self.platform_filter)
+        self.platform_filter = options[(position + 1) % len(options)]
+        self.apply_filters()
+
+    def action_cycle_status(self) -> None:
+        """Show only successful, then failed, then all results."""
+        position = STATUS_FILTERS.index(self.status_filter)
+        self.status_filter = STATUS_FILTERS[(position + 1) % len(STATUS_FILTERS)]
+        self.apply_filters()
+
+    def action_copy(self) -> None:
+        """Copy the selected post to the clipboard."""
+        if self._selected is None:
+            return
+        content = self.records[self._selected].get("output", "")
+        if not content:
+            self.notify("Nothing to copy", severity="warning")
+            return
+        try:
+            pyperclip.copy(content)
+            self.notify("Copied to clipboard!")
+        except Exception as e:
+            self.notify(f"Failed to copy: {e}", severity="error")
+
+
+class ReviewApp(App):
+    """Standalone app for reviewing the output of a batch run."""
+
+    theme = "textual-light"
+
+    def __init__(self, records: list[dict], source: str = ""):
+        super().__init__()
+        self.records = records
+        self.title = f"Postman review {source}".strip()
+
+    def on_mount(self) -> None:
+        watch_loop()
+        self.push_screen(ResultsScreen(self.records), lambda _: self.exit())
+
+
+class HistoryScreen(ResultsScreen):
+    """Search every post ever generated and pick one to reuse.
+
+    Searches go to the history database, so they cover all past sessions.
+    Selecting a post dismisses the screen with its entry.
+    """
+
+    BINDINGS = [("u", "reuse", "Use post")]
+
+    def __init__(self, history: PostHistory, **kwargs):
+        super().__init__([], **kwargs)
+        self.history = history
+        self.entries: list[HistoryEntry] = []
+
+    def search(self, query: str) -> None:
+        """Load the posts matching ``query`` from the history."""
+        self.entries = self.history.search(query)
+        self.records = [entry.as_result() for entry in self.entries]
+        self.apply_filters()
+
+    def apply_filters(self) -> None:
+        # The database has already matched the search text
+        self.query_text = ""
+        super().apply_filters()
+
+    def on_mount(self) -> None:
+        super().on_mount()
+        self.search("")
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        self.action_reuse()
+
+    def action_reuse(self) -> None:
+        """Dismiss with the selected post."""
+        if self._selected is not None:
+            self.dismiss(self.entries[self._selected])
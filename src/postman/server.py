@@ -0,0 +1,304 @@
+"""HTTP service that shares one generation backend between many clients.
+
+Speaks just enough HTTP/1.1 (keep-alive, chunked server-sent events) for
+``RemoteBackend`` and tools like ``curl``. Every request goes through the
+same backend, so all clients share its connection pool, response cache,
+in-flight request sharing and rate limits.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import time
+from typing import Optional
+
+from postman.backends import GenerationBackend
+from postman.llm import LLMError
+from postman.metrics import GenerationMetrics
+
+logger = logging.getLogger(__name__)
+
+# Largest request body accepted, in bytes
+MAX_BODY = 1_000_000
+
+# Most candidates one request may ask for
+MAX_CANDIDATES = 10
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    413: "Content Too Large",
+    502: "Bad Gateway",
+}
+
+
+class BadRequest(ValueError):
+    """A request the server refuses, with the status to answer it with."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_generation_request(body: bytes) -> dict:
+    """Validate a generation request body and fill in the defaults."""
+    try:
+        payload = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        raise BadRequest(f"Invalid JSON: {e}") from e
+    if not isinstance(payload, dict):
+        raise BadRequest("Expected a JSON object")
+    for name in ("system_prompt", "user_input"):
+        if not isinstance(payload.get(name), str):
+            raise BadRequest(f"{name!r} must be a string")
+    max_sentences = payload.get("max_sentences", 3)
+    if max_sentences is not None and not isinstance(max_sentences, int):
+        raise BadRequest("'max_sentences' must be an integer or null")
+    count = payload.get("count", 1)
+    if not isinstance(count, int) or not 1 <= count <= MAX_CANDIDATES:
+        raise BadRequest(f"'count' must be between 1 and {MAX_CANDIDATES}")
+    stop = payload.get("stop")
+    if stop is not None and not isinstance(stop, str):
+        raise BadRequest("'stop' must be a string or null")
+    return {
+        "system_prompt": payload["system_prompt"],
+        "user_input": payload["user_input"],
+        "max_sentences": max_sentences,
+        "use_cache": bool(payload.get("use_cache", True)),
+        "count": count,
+        "stop": stop,
+        "label": str(payload.get("label", "")),
+    }
+
+
+def metrics_summary(metrics: GenerationMetrics) -> dict:
+    """Get the parts of a generation's metrics reported back to clients."""
+    return {
+        "model": metrics.model,
+        "cached": metrics.cached,
+        "shared": metrics.shared,
+        "tokens_in": metrics.tokens_in,
+        "tokens_out": metrics.tokens_out,
+        "retries": metrics.retries,
+    }
+
+
+class PostmanServer:
+    """Async HTTP API over a generation backend.
+
+    ``POST /v1/generate`` returns a post, ``POST /v1/stream`` streams one as
+    server-sent events and ``POST /v1/candidates`` returns alternatives.
+    ``GET /health`` reports the backend's model. When ``token`` is set,
+    every request must send it as a bearer token.
+    """
+
+    def __init__(
+        self,
+        backend: GenerationBackend,
+        host: str = "127.0.0.1",
+        port: int = 8787,
+        token: str = "",
+    ):
+        self.backend = backend
+        self.host = host
+        self.port = port
+        self.token = token
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "PostmanServer":
+        """Start listening; with port 0 a free port is picked."""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        """Stop accepting connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                started = time.monotonic()
+                status = await self._route(method, path, headers, body, writer)
+                await writer.drain()
+                logger.info(
+                    "%s %s %d %.0fms",
+                    method,
+                    path,
+                    status,
+                    (time.monotonic() - started) * 1000,
+                )
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except BadRequest as e:
+            self._send_json(writer, e.status, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except Exception:
+            logger.exception("Request failed")
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> Optional[tuple[str, str, dict, bytes]]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0"))
+        if length > MAX_BODY:
+            raise BadRequest("Request body too large", status=413)
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], headers, body
+
+    def _authorized(self, headers: dict) -> bool:
+        if not self.token:
+            return True
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            credentials.strip(), self.token
+        )
+
+    async def _route(
+        self,
+        method: str,
+        path: str,
+        headers: dict,
+        body: bytes,
+        writer: asyncio.StreamWriter,
+    ) -> int:
+        """Answer one request and return its status."""
+        if method == "GET" and path == "/health":
+            return self._send_json(
+                writer, 200, {"status": "ok", "model": self.backend.model}
+            )
+        if not self._authorized(headers):
+            return self._send_json(writer, 401, {"error": "Invalid or missing token"})
+        handlers = {
+            "/v1/generate": self._generate,
+            "/v1/stream": self._stream,
+            "/v1/candidates": self._candidates,
+        }
+        handler = handlers.get(path)
+        if method != "POST" or handler is None:
+            return self._send_json(writer, 404, {"error": "Not found"})
+        try:
+            request = parse_generation_request(body)
+        except BadRequest as e:
+            return self._send_json(writer, e.status, {"error": str(e)})
+        return await handler(request, writer)
+
+    async def _generate(self, request: dict, writer: asyncio.StreamWriter) -> int:
+        metrics = GenerationMetrics(label=request["label"])
+        try:
+            output = await self.backend.generate(
+                request["system_prompt"],
+                request["user_input"],
+                max_sentences=request["max_sentences"],
+                use_cache=request["use_cache"],
+                metrics=metrics,
+            )
+        except LLMError as e:
+            return self._send_json(writer, 502, {"error": str(e)})
+        return self._send_json(
+            writer, 200, {"output": output, **metrics_summary(metrics)}
+        )
+
+    async def _candidates(self, request: dict, writer: asyncio.StreamWriter) -> int:
+        metrics = GenerationMetrics(label=request["label"])
+        try:
+            outputs = await self.backend.generate_candidates(
+                request["system_prompt"],
+                request["user_input"],
+                request["count"],
+                max_sentences=request["max_sentences"],
+                use_cache=request["use_cache"],
+                metrics=metrics,
+            )
+        except LLMError as e:
+            return self._send_json(writer, 502, {"error": str(e)})
+        return self._send_json(
+            writer, 200, {"outputs": outputs, **metrics_summary(metrics)}
+        )
+
+    async def _stream(self, request: dict, writer: asyncio.StreamWriter) -> int:
+        """Stream a post as server-sent events.
+
+        Each chunk is sent as ``{"chunk": ...}``; the last event is either
+        ``{"done": true, ...}`` with the metrics or ``{"error": ...}``.
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        metrics = GenerationMetrics(label=request["label"])
+        stream = self.backend.generate_stream(
+            request["system_prompt"],
+            request["user_input"],
+            max_sentences=request["max_sentences"],
+            use_cache=request["use_cache"],
+            metrics=metrics,
+            stop=request["stop"],
+        )
+        try:
+            async for chunk in stream:
+                self._send_event(writer, {"chunk": chunk})
+                # Stops the upstream stream if the client went away
+                await writer.drain()
+        except LLMError as e:
+            self._send_event(writer, {"error": str(e)})
+        else:
+            self._send_event(writer, {"done": True, **metrics_summary(metrics)})
+        finally:
+            await stream.aclose()
+        writer.write(b"0\r\n\r\n")
+        return 200
+
+    @staticmethod
+    def _send_event(writer: asyncio.StreamWriter, payload: dict) -> None:
+        data = f"data: {json.dumps(payload)}\n\n".encode()
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    @staticmethod
+    def _send_json(writer: asyncio.StreamWriter, status: int, payload: dict) -> int:
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        return status
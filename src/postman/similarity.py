@@ -0,0 +1,203 @@
+"""Local near-duplicate detection for events that were posted about before."""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional
+
+from postman.history import HistoryEntry
+from postman.prompts import Platform
+
+# Words per shingle: long enough that common words alone don't make events
+# look alike, short enough that a small edit only changes a few shingles
+SHINGLE_WORDS = 3
+
+# Smallest shingle hashes kept per event (a bottom-k MinHash sketch)
+SKETCH_SIZE = 64
+
+# Events with fewer shingles than this are too short to compare reliably
+MIN_SHINGLES = 8
+
+# Most recent posts loaded from the history into the index
+INDEXED_POSTS = 1000
+
+# Event fields swapped into a reused post
+SUBSTITUTED_FIELDS = ("title", "date", "time", "location")
+
+# Fields only swapped inside the event detail lines
+DETAIL_FIELDS = ("date", "time", "location")
+
+_WORD = re.compile(r"\w+")
+
+# Event detail lines: bullets, or lines starting with a detail label
+_BULLET_LINE = re.compile(r"^\s*[•\-*]")
+_LABEL_LINE = re.compile(r"^\s*(date|time|location)\s*:", re.IGNORECASE)
+
+
+def event_text(fields: Mapping[str, str]) -> str:
+    """Build the text events are compared by.
+
+    Only the description is used. The other fields change with every
+    edition of a recurring event and are swapped in on reuse, and the
+    prompt boilerplate around them would make every event look alike.
+    """
+    return fields.get("description", "")
+
+
+def shingles(text: str) -> set[str]:
+    """Split text into overlapping runs of ``SHINGLE_WORDS`` words."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[i : i + SHINGLE_WORDS])
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def _hash(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def sketch(text: str) -> frozenset[int]:
+    """Build the MinHash sketch of a text: its smallest shingle hashes."""
+    hashes = sorted(_hash(shingle) for shingle in shingles(text))
+    if len(hashes) < MIN_SHINGLES:
+        return frozenset()
+    return frozenset(hashes[:SKETCH_SIZE])
+
+
+def similarity(a: frozenset[int], b: frozenset[int]) -> float:
+    """Estimate the Jaccard similarity of two texts from their sketches."""
+    if not a or not b:
+        return 0.0
+    union = sorted(a | b)[:SKETCH_SIZE]
+    return sum(value in a and value in b for value in union) / len(union)
+
+
+def _value_pattern(values: Iterable[str]) -> re.Pattern:
+    """Match whole values, never part of a word or of a hashtag."""
+    ordered = sorted(values, key=len, reverse=True)
+    alternatives = "|".join(re.escape(value) for value in ordered)
+    return re.compile(rf"(?<![\w#])(?:{alternatives})(?!\w)")
+
+
+def _is_detail_line(line: str) -> bool:
+    return bool(_BULLET_LINE.match(line) or _LABEL_LINE.match(line))
+
+
+def substitute_details(
+    post: str, previous: Mapping[str, str], current: Mapping[str, str]
+) -> Optional[str]:
+    """Swap the details of a past event for the current ones in its post.
+
+    Dates, times and locations are only swapped in the event detail lines,
+    and titles anywhere but in hashtags, always as whole words. Returns
+    ``None`` if a changed detail can't be found where it belongs, or also
+    appears elsewhere in the post, since the old value would then be left
+    behind.
+    """
+    anywhere: Dict[str, str] = {}
+    in_details: Dict[str, str] = {}
+    for name in SUBSTITUTED_FIELDS:
+        before = previous.get(name, "").strip()
+        after = current.get(name, "").strip()
+        if before == after:
+            continue
+        if not before or not after:
+            return None
+        (in_details if name in DETAIL_FIELDS else anywhere)[before] = after
+    if not anywhere and not in_details:
+        return post
+
+    lines = post.split("\n")
+    details = [_is_detail_line(line) for line in lines]
+    if anywhere:
+        found = {match.group(0) for match in _value_pattern(anywhere).finditer(post)}
+        if found != set(anywhere):
+            return None
+    if in_details:
+        pattern = _value_pattern(in_details)
+        found = set()
+        for line, detail in zip(lines, details):
+            matches = {match.group(0) for match in pattern.finditer(line)}
+            if matches and not detail:
+                return None
+            found |= matches
+        if found != set(in_details):
+            return None
+
+    # Replace all values of a line in one pass so a new value is never
+    # replaced again
+    substituted = []
+    for line, detail in zip(lines, details):
+        replacements = {**anywhere, **(in_details if detail else {})}
+        if replacements:
+            line = _value_pattern(replacements).sub(
+                lambda match: replacements[match.group(0)], line
+            )
+        substituted.append(line)
+    return "\n".join(substituted)
+
+
+_Indexed = tuple[frozenset[int], HistoryEntry]
+
+
+@dataclass
+class SimilarMatch:
+    """A past post whose event resembles the current one."""
+
+    entry: HistoryEntry
+    score: float
+
+
+class SimilarityIndex:
+    """MinHash sketches of past events, searched per platform.
+
+    Posts are only compared with posts for the same platform, since each
+    platform's posts follow different format rules.
+
+    Lookups compare sketches of at most ``SKETCH_SIZE`` hashes each, which
+    takes a few milliseconds for a thousand posts, so no bucketing is used.
+    """
+
+    def __init__(self):
+        # Sketch and entry of each post by platform and history id
+        self._sketches: Dict[str, Dict[int, _Indexed]] = {}
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[HistoryEntry]) -> "SimilarityIndex":
+        """Build an index of past posts."""
+        index = cls()
+        for entry in entries:
+            index.add(entry)
+        return index
+
+    def add(self, entry: HistoryEntry) -> None:
+        """Index a post, replacing any earlier version of the same entry."""
+        signature = sketch(event_text(entry.fields))
+        if not signature:
+            return
+        self._sketches.setdefault(entry.platform, {})[entry.id] = (signature, entry)
+
+    def best_match(
+        self, fields: Mapping[str, str], platform: Platform
+    ) -> Optional[SimilarMatch]:
+        """Find the past post for this platform with the most similar event.
+
+        Ties go to the most recent post.
+        """
+        signature = sketch(event_text(fields))
+        if not signature:
+            return None
+        best: Optional[SimilarMatch] = None
+        for other, entry in self._sketches.get(platform.value, {}).values():
+            score = similarity(signature, other)
+            if (
+                best is None
+                or score > best.score
+                or (score == best.score and entry.created_at > best.entry.created_at)
+            ):
+                best = SimilarMatch(entry, score)
+        return best if best is not None and best.score > 0 else None
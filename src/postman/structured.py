@@ -0,0 +1,121 @@
+"""Incremental parsing of posts streamed as marked-up fields."""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Written by the model after the last field
+END_MARKER = "[END]"
+
+# Every field a post can have, in the order they are assembled
+FIELD_ORDER = ("hook", "body", "details", "question", "hashtags")
+
+# A field marker, possibly followed by the start of the field on its line
+_MARKER = re.compile(
+    r"^\s*\[(%s|end)\](?P<rest>.*)$" % "|".join(FIELD_ORDER), re.IGNORECASE
+)
+
+# A line that may still turn into a marker once more of it arrives
+_PARTIAL_MARKER = re.compile(r"^\s*(\[[A-Za-z]*\]?\s*)?$")
+
+
+@dataclass(frozen=True)
+class FieldEvent:
+    """Progress on one field of a streamed post.
+
+    While the field streams, ``text`` is the newly arrived text; the final
+    event for a field has ``done`` set and the field's whole value.
+    """
+
+    field: str
+    text: str
+    done: bool = False
+
+
+class StructuredParser:
+    """Turns streamed chunks into field events as soon as they are known.
+
+    A line is held back only while it could still be a field marker, so
+    text reaches the caller almost as fast as it streams. Whitespace
+    between fields is dropped. If the model ignores the markers, the raw
+    text is kept and returned by ``text()``.
+    """
+
+    def __init__(self) -> None:
+        self.values: Dict[str, str] = {}
+        self.current: Optional[str] = None
+        # Set by [END]; anything after it is the model running on
+        self.finished = False
+        self._line = ""
+        self._midline = False
+        self._pending = ""
+        self._preamble: list[str] = []
+
+    def feed(self, chunk: str) -> list[FieldEvent]:
+        """Parse the next chunk of the stream."""
+        events: list[FieldEvent] = []
+        self._line += chunk
+        while "\n" in self._line:
+            line, self._line = self._line.split("\n", 1)
+            self._handle_line(f"{line}\n", events)
+            self._midline = False
+        if self._line and (self._midline or not _PARTIAL_MARKER.match(self._line)):
+            self._handle_line(self._line, events)
+            self._line = ""
+            self._midline = True
+        return events
+
+    def close(self) -> list[FieldEvent]:
+        """Finish parsing at the end of the stream."""
+        events: list[FieldEvent] = []
+        if self._line:
+            self._handle_line(self._line, events)
+            self._line = ""
+        self._finish_field(events)
+        return events
+
+    def text(self) -> str:
+        """Assemble the post from its fields, in the platform's order."""
+        if not self.values:
+            return "".join(self._preamble).strip()
+        return "\n\n".join(
+            self.values[field] for field in FIELD_ORDER if self.values.get(field)
+        )
+
+    def _handle_line(self, line: str, events: list[FieldEvent]) -> None:
+        match = None if self._midline else _MARKER.match(line)
+        if match is None:
+            self._add_text(line, events)
+            return
+        self._finish_field(events)
+        name = match.group(1).lower()
+        if name == "end" or name in self.values:
+            # A repeated field means the model started over
+            self.finished = True
+        else:
+            self.current = name
+            self.values[name] = ""
+            self._pending = ""
+        self._add_text(match.group("rest"), events)
+
+    def _finish_field(self, events: list[FieldEvent]) -> None:
+        if self.current is None:
+            return
+        events.append(FieldEvent(self.current, self.values[self.current], done=True))
+        self.current = None
+
+    def _add_text(self, text: str, events: list[FieldEvent]) -> None:
+        if self.finished:
+            return
+        if self.current is None:
+            self._preamble.append(text)
+            return
+        combined = self._pending + text
+        if not self.values[self.current]:
+            combined = combined.lstrip()
+        # Hold trailing whitespace until more text shows it isn't the end
+        body = combined.rstrip()
+        self._pending = combined[len(body) :]
+        if body:
+            self.values[self.current] += body
+            events.append(FieldEvent(self.current, body))
@@ -0,0 +1,245 @@
+"""Local format checks and deterministic fixes for generated posts."""
+
+import re
+from typing import Mapping
+
+from postman.prompts import FormatRules, Platform, PromptManager
+from postman.ranking import DETAIL_LABELS, HASHTAG, detail_bullets, hashtags
+
+# Added, in order, to posts with too few hashtags
+DEFAULT_HASHTAGS = (
+    "#Python",
+    "#HKPUG",
+    "#TechCommunity",
+    "#HongKong",
+    "#Programming",
+    "#Coding",
+    "#TechEvent",
+    "#LearnToCode",
+    "#PythonProgramming",
+    "#Developers",
+)
+
+# What models put before a detail: bullets, emoji, bold markers or numbers
+_PREFIX = r"(?:(?:[^\w\s]|\d+[.)])\s*)*"
+# A detail label, possibly in bold, and its colon
+_LABEL = r"(%s)\**\s*:\**\s*" % "|".join(DETAIL_LABELS)
+
+_DETAIL_LINE = re.compile(
+    r"^\s*(?:•|[-*](?=\s))\s*%s%s(.*)$" % (_PREFIX, _LABEL), re.IGNORECASE
+)
+_BULLET_LINE = re.compile(r"^\s*(?:[^\w\s#]|\d+[.)])")
+# A labelled detail line however the model decorated it, even without a bullet
+_LABELLED_LINE = re.compile(r"^\s*%s%s(.*)$" % (_PREFIX, _LABEL), re.IGNORECASE)
+# A detail label anywhere in a line, such as in details run together
+_ANY_LABEL = re.compile(r"\b%s" % _LABEL, re.IGNORECASE)
+
+
+def _detail_labels(text: str) -> list[str]:
+    """Get the labels of the detail bullets in a post, in order."""
+    labels = []
+    for line in text.split("\n"):
+        match = _DETAIL_LINE.match(line)
+        if match:
+            labels.append(match.group(1).title())
+    return labels
+
+
+def _has_compact_details(text: str) -> bool:
+    return any(
+        len(bullet.split("|")) >= len(DETAIL_LABELS) for bullet in detail_bullets(text)
+    )
+
+
+def _check_hashtags(text: str, rules: FormatRules) -> list[str]:
+    count = len(hashtags(text))
+    if count < rules.min_hashtags:
+        return [
+            f"The post has {count} hashtags; it needs at least {rules.min_hashtags}."
+        ]
+    if count > rules.max_hashtags:
+        return [
+            f"The post has {count} hashtags; it must have at most {rules.max_hashtags}."
+        ]
+    return []
+
+
+def _check_details(text: str, rules: FormatRules) -> list[str]:
+    if rules.compact_details:
+        if not _has_compact_details(text):
+            return ["The event details line '• date | time | location' is missing."]
+        return []
+    labels = _detail_labels(text)
+    missing = [label for label in DETAIL_LABELS if label not in labels]
+    if missing:
+        return [f"The event detail bullets are missing: {', '.join(missing)}."]
+    if labels != list(DETAIL_LABELS):
+        return ["The event detail bullets must be in the order Date, Time, Location."]
+    return []
+
+
+def check_format(text: str, platform: Platform) -> list[str]:
+    """List the ways a post breaks its platform's format rules."""
+    rules = PromptManager.get_format_rules(platform)
+    problems = []
+    if rules.max_chars is not None and len(text) > rules.max_chars:
+        problems.append(
+            f"The post is {len(text)} characters long; "
+            f"it must be at most {rules.max_chars}."
+        )
+    return problems + _check_hashtags(text, rules) + _check_details(text, rules)
+
+
+def check_field(field: str, value: str, platform: Platform) -> list[str]:
+    """List the ways one field of a structured post breaks the format rules.
+
+    Only the rules that can be judged from the field alone are checked;
+    the length of the whole post is left to ``check_format``.
+    """
+    rules = PromptManager.get_format_rules(platform)
+    if not value.strip():
+        return [f"The {field} is empty."]
+    if field == "details":
+        return _check_details(value, rules)
+    if field == "hashtags":
+        return _check_hashtags(value, rules)
+    return []
+
+
+def _is_hashtag_line(line: str) -> bool:
+    words = line.split()
+    return bool(words) and all(word.startswith("#") for word in words)
+
+
+def _has_unrecognized_details(lines: list[str], fields: Mapping[str, str]) -> bool:
+    """Check if a post seems to give its details in a form that isn't parsed.
+
+    That is a detail label inside a line, or the form's date and time
+    together. Such posts are left for the LLM to repair rather than given
+    a second copy of their details.
+    """
+    values = [fields.get(name, "").strip().lower() for name in ("date", "time")]
+    for line in lines:
+        if _is_hashtag_line(line):
+            continue
+        match = _LABELLED_LINE.match(line)
+        if _ANY_LABEL.search(line, match.end(1) if match else 0):
+            return True
+        if all(value and value in line.lower() for value in values):
+            return True
+    return False
+
+
+def _insert_block(lines: list[str], block: list[str]) -> list[str]:
+    """Insert a paragraph before the trailing hashtags, or at the end."""
+    end = len(lines)
+    while end > 0 and (not lines[end - 1].strip() or _is_hashtag_line(lines[end - 1])):
+        end -= 1
+    if end == len(lines) or not any(_is_hashtag_line(line) for line in lines[end:]):
+        end = len(lines)
+    head = "\n".join(lines[:end]).rstrip("\n").split("\n")
+    tail = "\n".join(lines[end:]).lstrip("\n")
+    result = head + [""] + block
+    if tail:
+        result += [""] + tail.split("\n")
+    return result
+
+
+def _fix_details(text: str, rules: FormatRules, fields: Mapping[str, str]) -> str:
+    """Reinsert missing or misordered event detail bullets from the form.
+
+    Details the model wrote without bullets, or behind emoji, bold markers
+    or numbers, are rewritten as bullets in place rather than repeated.
+    Details in a form that can't be parsed are left for the LLM to repair.
+    """
+    lines = text.split("\n")
+    if rules.compact_details:
+        if _has_compact_details(text):
+            return text
+        values = [fields.get(label.lower(), "").strip() for label in DETAIL_LABELS]
+        if not all(values):
+            return text
+        line = "• " + " | ".join(values)
+        # Replace partial or labelled details rather than adding to them
+        stale = [
+            i
+            for i, existing in enumerate(lines)
+            if _LABELLED_LINE.match(existing)
+            or (_BULLET_LINE.match(existing) and "|" in existing)
+        ]
+        if not stale:
+            if _has_unrecognized_details(lines, fields):
+                return text
+            return "\n".join(_insert_block(lines, [line]))
+        kept = [existing for i, existing in enumerate(lines) if i not in stale]
+        return "\n".join(kept[: stale[0]] + [line] + kept[stale[0] :])
+
+    if _detail_labels(text) == list(DETAIL_LABELS):
+        return text
+    found: dict[str, str] = {}
+    first = None
+    for i, line in enumerate(lines):
+        match = _LABELLED_LINE.match(line)
+        if match:
+            found.setdefault(match.group(1).title(), match.group(2).strip())
+            first = i if first is None else first
+    values = {
+        label: found.get(label) or fields.get(label.lower(), "").strip()
+        for label in DETAIL_LABELS
+    }
+    if not all(values.values()):
+        return text
+    # Without labelled lines to rewrite, only run-together labels count
+    if _has_unrecognized_details(lines, fields if first is None else {}):
+        return text
+
+    block = [f"• {label}: {values[label]}" for label in DETAIL_LABELS]
+    if first is None:
+        return "\n".join(_insert_block(lines, block))
+    # Keep the details where the model put them, in the required order
+    kept = [line for line in lines if not _LABELLED_LINE.match(line)]
+    return "\n".join(kept[:first] + block + kept[first:])
+
+
+def _drop_hashtags(text: str, keep: int) -> str:
+    """Remove hashtags after the first ``keep``, tidying up left-over space."""
+    for match in reversed(list(HASHTAG.finditer(text))[keep:]):
+        text = text[: match.start()] + text[match.end() :]
+    lines = [re.sub(r"[ \t]{2,}", " ", line).rstrip() for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _add_hashtags(text: str, count: int) -> str:
+    """Append up to ``count`` default hashtags the post does not use yet."""
+    used = {tag.lower() for tag in hashtags(text)}
+    extra = [tag for tag in DEFAULT_HASHTAGS if tag.lower() not in used][:count]
+    if not extra:
+        return text
+    lines = text.split("\n")
+    if lines and _is_hashtag_line(lines[-1]):
+        lines[-1] = f"{lines[-1]} {' '.join(extra)}"
+        return "\n".join(lines)
+    return f"{text}\n\n{' '.join(extra)}"
+
+
+def fix_format(
+    text: str, platform: Platform, fields: Mapping[str, str]
+) -> tuple[str, list[str]]:
+    """Apply the deterministic fixes a post needs.
+
+    Reinserts missing event details from the form ``fields``, trims or tops
+    up hashtags, and drops surplus hashtags from posts that are too long.
+    Returns the fixed post and the problems that are left for the LLM.
+    """
+    rules = PromptManager.get_format_rules(platform)
+    text = _fix_details(text.strip(), rules, fields)
+
+    count = len(hashtags(text))
+    if count > rules.max_hashtags:
+        text = _drop_hashtags(text, rules.max_hashtags)
+    elif count < rules.min_hashtags:
+        text = _add_hashtags(text, rules.min_hashtags - count)
+
+    if rules.max_chars is not None and len(text) > rules.max_chars:
+        text = _drop_hashtags(text, rules.min_hashtags)
+    return text, check_format(text, platform)
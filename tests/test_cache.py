@@ -0,0 +1,70 @@
+import sqlite3
+
+from postman.cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_least_recently_used_evicted(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("postman.cache.time", clock)
+    cache = ResponseCache(tmp_path / "cache.db", max_entries=2)
+    cache.set("a", "A")
+    clock.now += 1
+    cache.set("b", "B")
+    clock.now += 1
+    assert cache.get("a") == "A"
+    clock.now += 1
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_expired_entries_missing(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("postman.cache.time", clock)
+    cache = ResponseCache(tmp_path / "cache.db", ttl=60)
+    cache.set("a", "A")
+    clock.now += 30
+    # Reading an entry does not extend its lifetime
+    assert cache.get("a") == "A"
+    clock.now += 31
+    assert cache.get("a") is None
+
+
+def test_entries_persist(tmp_path):
+    ResponseCache(tmp_path / "cache.db").set("a", "A")
+    assert ResponseCache(tmp_path / "cache.db").get("a") == "A"
+
+
+def test_corrupt_file_falls_back_to_memory(tmp_path):
+    path = tmp_path / "cache.db"
+    path.write_bytes(b"not a database" * 100)
+    cache = ResponseCache(path)
+    assert cache.get("a") is None
+    cache.set("a", "A")
+    assert cache.get("a") == "A"
+
+
+def test_database_errors_are_misses(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.db")
+    cache.set("a", "A")
+    # Another process holding a write lock
+    other = sqlite3.connect(tmp_path / "cache.db", isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE")
+    cache._conn.execute("PRAGMA busy_timeout = 0")
+    try:
+        assert cache.get("a") is None
+        cache.set("b", "B")
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    assert cache.get("a") == "A"
+    assert cache.get("b") is None
@@ -0,0 +1,190 @@
+import asyncio
+
+from langchain_core.messages import AIMessageChunk
+
+from postman.cache import ResponseCache
+from postman.engine import GenerationEngine
+from postman.llm import LLMClient
+from postman.metrics import MetricsRecorder
+
+FIELDS = {
+    "title": "PyNight",
+    "date": "Mar 1, 2026",
+    "time": "7:00 PM",
+    "location": "Central",
+    "description": "Monthly meetup",
+}
+
+STRUCTURED = (
+    "[BODY]\nJoin us for PyNight!\n"
+    "[DETAILS]\n• Date: Mar 1, 2026\n• Time: 7:00 PM\n• Location: Central\n"
+    "[HASHTAGS]\n#Python #HKPUG\n"
+    "[END]\nAnything else I can help with?"
+)
+
+
+class FakeChatModel:
+    """Streams a fixed response in small chunks, ignoring stop sequences."""
+
+    def __init__(self, response, model_name="fake", delay=0.0, chunk_delay=0.0):
+        self.response = response
+        self.model_name = model_name
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        # How long a cancelled stream takes to shut down
+        self.close_delay = 0.0
+        self.requests = 0
+        self.stops = []
+
+    async def astream(self, messages, stop=None):
+        self.requests += 1
+        self.stops.append(stop)
+        try:
+            await asyncio.sleep(self.delay)
+            for i in range(0, len(self.response), 4):
+                await asyncio.sleep(self.chunk_delay)
+                yield AIMessageChunk(content=self.response[i : i + 4])
+        except asyncio.CancelledError:
+            await asyncio.sleep(self.close_delay)
+            raise
+
+
+def make_client(tmp_path, response):
+    client = LLMClient(
+        model="fake",
+        cache=ResponseCache(tmp_path / "cache.db"),
+        metrics=MetricsRecorder(),
+        api_key="test",
+        base_url="http://127.0.0.1:9",
+    )
+    client.client = FakeChatModel(response)
+    return client
+
+
+async def read(client, user_input="u"):
+    return "".join([chunk async for chunk in client.generate_stream("s", user_input)])
+
+
+def test_identical_streams_share_one_request(tmp_path):
+    async def run():
+        client = make_client(tmp_path, "Join us for PyNight!")
+        client.client.chunk_delay = 0.01
+        try:
+            texts = await asyncio.gather(read(client), read(client), read(client, "v"))
+        finally:
+            await client.aclose()
+        return client, texts
+
+    client, texts = asyncio.run(run())
+    assert texts == ["Join us for PyNight!"] * 3
+    assert client.client.requests == 2
+    assert sorted(m.shared for m in client.metrics.recent) == [False, False, True]
+
+
+def test_stream_continues_for_callers_that_stay(tmp_path):
+    async def run():
+        client = make_client(tmp_path, "Join us for PyNight!")
+        client.client.chunk_delay = 0.01
+        try:
+            leaving = asyncio.create_task(read(client))
+            staying = asyncio.create_task(read(client))
+            await asyncio.sleep(0.02)
+            leaving.cancel()
+            text = await staying
+        finally:
+            await client.aclose()
+        return client, leaving, text
+
+    client, leaving, text = asyncio.run(run())
+    assert leaving.cancelled()
+    assert text == "Join us for PyNight!"
+    assert client.client.requests == 1
+
+
+def test_cancelling_stream_not_joined(tmp_path):
+    async def run():
+        client = make_client(tmp_path, "Join us for PyNight!")
+        client.client.chunk_delay = 0.01
+        client.client.close_delay = 0.1
+        try:
+            leaving = asyncio.create_task(read(client))
+            await asyncio.sleep(0.02)
+            leaving.cancel()
+            await asyncio.gather(leaving, return_exceptions=True)
+            (flight,) = client._flights.values()
+            assert flight.task.cancelling()
+            text = await read(client)
+        finally:
+            await client.aclose()
+        return client, text
+
+    client, text = asyncio.run(run())
+    assert text == "Join us for PyNight!"
+    assert client.client.requests == 2
+
+
+def test_structured_stream_stopped_at_end_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("POSTMAN_STRUCTURED", "1")
+    monkeypatch.setenv("POSTMAN_HISTORY", "0")
+    monkeypatch.setenv("POSTMAN_REPAIR", "0")
+
+    async def run():
+        client = make_client(tmp_path, STRUCTURED)
+        engine = GenerationEngine(client)
+        chunks = []
+        try:
+            for _ in range(2):
+                results = await engine.generate_all(
+                    FIELDS, ["linkedin"], on_chunk=lambda p, c: chunks.append(c)
+                )
+        finally:
+            await client.aclose()
+        return client, results, "".join(chunks)
+
+    client, results, shown = asyncio.run(run())
+    assert client.client.requests == 1
+    assert client.client.stops == [["[END]"]]
+    assert "Anything else" not in shown
+    assert results["linkedin"].startswith("Join us for PyNight!")
+    assert [m.status for m in client.metrics.recent] == ["ok", "ok"]
+    assert client.metrics.recent[1].cached
+
+
+def test_stream_cut_at_stop_split_across_chunks(tmp_path):
+    async def run():
+        client = make_client(tmp_path, "Hello there [END] and more")
+        try:
+            return client, [
+                chunk
+                async for chunk in client.generate_stream("s", "u", stop="[END]")
+            ]
+        finally:
+            await client.aclose()
+
+    client, chunks = asyncio.run(run())
+    assert "".join(chunks) == "Hello there "
+    assert client.metrics.recent[-1].status == "ok"
+
+
+def test_fallback_answers_not_cached_as_primary(tmp_path):
+    async def run():
+        client = make_client(tmp_path, "Primary post")
+        client.client.delay = 1.0
+        client.hedge_after = 0.01
+        client.fallback_models = ["backup"]
+        client._fallback_clients["backup"] = FakeChatModel("Backup post", "backup")
+        try:
+            first = "".join([chunk async for chunk in client.generate_stream("s", "u")])
+            client.client.delay = 0.0
+            client.fallback_models = []
+            second = "".join(
+                [chunk async for chunk in client.generate_stream("s", "u")]
+            )
+        finally:
+            await client.aclose()
+        return client, first, second
+
+    client, first, second = asyncio.run(run())
+    assert (first, second) == ("Backup post", "Primary post")
+    assert client.metrics.recent[0].model == "backup"
+    assert not client.metrics.recent[1].cached
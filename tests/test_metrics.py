@@ -0,0 +1,14 @@
+from postman.metrics import GenerationMetrics, MetricsRecorder
+
+
+def test_prometheus_values_written_in_full(tmp_path):
+    path = tmp_path / "postman.prom"
+    recorder = MetricsRecorder(prometheus_path=path)
+    metrics = GenerationMetrics(
+        model="fake", latency=1e-07, tokens_in=1234567, tokens_out=3
+    )
+    recorder.record(metrics)
+    lines = path.read_text().splitlines()
+    assert 'postman_tokens_total{model="fake",direction="in"} 1234567' in lines
+    assert 'postman_generation_latency_seconds_sum{model="fake"} 0.0000001' in lines
+    assert not any("e-" in line or "e+" in line for line in lines)
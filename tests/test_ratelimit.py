@@ -0,0 +1,52 @@
+import asyncio
+
+from postman.ratelimit import AdaptiveConcurrency, RateLimiter
+
+
+def test_latency_baselines_kept_per_kind():
+    concurrency = AdaptiveConcurrency(8)
+    concurrency.limit = 3.0
+    for _ in range(4):
+        concurrency.on_success(0.3, "stream")
+    limit = concurrency.limit
+    concurrency.on_success(3.0)
+    assert concurrency.limit > limit
+
+    limit = concurrency.limit
+    concurrency.on_success(3.0, "stream")
+    assert concurrency.limit < limit
+
+
+def test_held_slot_released_by_caller():
+    async def run():
+        limiter = RateLimiter(max_concurrency=2)
+        async with limiter.slot(hold=True) as release:
+            pass
+        assert limiter.concurrency.in_flight == 1
+        release()
+        release()
+        assert limiter.concurrency.in_flight == 0
+
+        try:
+            async with limiter.slot(hold=True):
+                raise ValueError
+        except ValueError:
+            pass
+        assert limiter.concurrency.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_slot_passed_on_when_woken_waiter_is_cancelled():
+    async def run():
+        concurrency = AdaptiveConcurrency(1)
+        await concurrency.acquire()
+        cancelled = asyncio.create_task(concurrency.acquire())
+        waiting = asyncio.create_task(concurrency.acquire())
+        await asyncio.sleep(0)
+        concurrency.release()
+        cancelled.cancel()
+        await asyncio.wait_for(waiting, timeout=1)
+        assert concurrency.in_flight == 1
+
+    asyncio.run(run())
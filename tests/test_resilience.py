@@ -0,0 +1,95 @@
+import email.utils
+import time
+
+import httpx
+import openai
+import pytest
+
+from postman.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    is_outage,
+    is_retryable,
+    retry_after,
+)
+
+
+def status_error(status, headers=None):
+    request = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+def open_breaker(reset_timeout=0.0):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=reset_timeout)
+    for _ in range(2):
+        breaker.record_failure(status_error(503), breaker.before_call())
+    return breaker
+
+
+def test_errors_classified():
+    assert is_retryable(TimeoutError())
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(status_error(429))
+    assert is_retryable(status_error(503))
+    assert not is_retryable(status_error(400))
+    assert not is_retryable(ValueError())
+
+    assert is_outage(status_error(502))
+    assert not is_outage(status_error(429))
+
+
+def test_retry_after_headers():
+    assert retry_after(status_error(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after(status_error(429, {"retry-after": "3"})) == 3.0
+    when = email.utils.formatdate(time.time() + 60, usegmt=True)
+    assert 55 < retry_after(status_error(429, {"retry-after": when})) <= 60
+    assert retry_after(status_error(429, {"retry-after": "soon"})) is None
+    assert retry_after(status_error(429)) is None
+    assert retry_after(ValueError()) is None
+
+
+def test_breaker_opens_after_outages_only():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure(status_error(503))
+    breaker.record_failure(status_error(400))
+    breaker.record_failure(status_error(503))
+    assert not breaker.is_open
+
+    breaker.record_failure(status_error(503))
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_lets_one_trial_through():
+    breaker = open_breaker()
+    assert breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert not breaker.before_call()
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = open_breaker()
+    trial = breaker.before_call()
+    breaker.record_failure(status_error(503), trial)
+    assert breaker.is_open
+    assert breaker.before_call()
+
+
+def test_only_trial_frees_trial_slot():
+    breaker = open_breaker()
+    assert breaker.before_call()
+    # A call admitted before the breaker opened is cancelled or fails
+    breaker.release(False)
+    breaker.record_failure(status_error(503))
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker = open_breaker()
+    breaker.release(breaker.before_call())
+    assert breaker.before_call()
@@ -0,0 +1,125 @@
+from postman.history import HistoryEntry
+from postman.prompts import Platform
+from postman.similarity import SimilarityIndex, substitute_details
+
+DESCRIPTION = (
+    "Our monthly meetup for Python developers in Hong Kong. Lightning talks, "
+    "networking and pizza. Bring a friend and your laptop for the hacking "
+    "session after the talks."
+)
+
+PREVIOUS = {
+    "title": "PyNight #41",
+    "date": "Mar 1, 2026",
+    "time": "7:00 PM",
+    "location": "HK",
+    "description": DESCRIPTION,
+}
+
+POST = """Join HK Python folks at PyNight #41 for talks and pizza!
+
+• Date: Mar 1, 2026
+• Time: 7:00 PM
+• Location: HK
+
+#Python #HKPUG #HK"""
+
+
+def entry(entry_id, platform="linkedin", created_at=0.0, **fields):
+    return HistoryEntry(
+        entry_id, platform, "model", "post", created_at, {**PREVIOUS, **fields}
+    )
+
+
+def test_substitute_details_only_in_detail_lines():
+    current = {**PREVIOUS, "location": "Cyberport", "date": "Apr 5, 2026"}
+    # "HK" also appears in the text, so it can't be swapped safely
+    assert substitute_details(POST, PREVIOUS, current) is None
+
+    post = POST.replace("Join HK Python folks", "Join us")
+    assert substitute_details(post, PREVIOUS, current) == (
+        "Join us at PyNight #41 for talks and pizza!\n\n"
+        "• Date: Apr 5, 2026\n"
+        "• Time: 7:00 PM\n"
+        "• Location: Cyberport\n\n"
+        "#Python #HKPUG #HK"
+    )
+
+
+def test_substitute_details_title_as_whole_words_outside_hashtags():
+    previous = {**PREVIOUS, "title": "PyNight"}
+    current = {**previous, "title": "PyCon"}
+    post = "PyNight is back!\n\n• Date: Mar 1, 2026\n\n#PyNight #PyNights"
+    assert substitute_details(post, previous, current) == (
+        "PyCon is back!\n\n• Date: Mar 1, 2026\n\n#PyNight #PyNights"
+    )
+
+
+def test_substitute_details_plain_detail_labels():
+    current = {**PREVIOUS, "time": "6:30 PM"}
+    post = "Join us!\n\nDate: Mar 1, 2026\nTime: 7:00 PM\nLocation: HK"
+    assert substitute_details(post, PREVIOUS, current) == (
+        "Join us!\n\nDate: Mar 1, 2026\nTime: 6:30 PM\nLocation: HK"
+    )
+
+
+def test_substitute_details_missing_or_cleared_value():
+    assert substitute_details(POST, PREVIOUS, {**PREVIOUS, "time": ""}) is None
+    post = POST.replace("• Time: 7:00 PM\n", "")
+    assert substitute_details(post, PREVIOUS, {**PREVIOUS, "time": "8 PM"}) is None
+
+
+def test_substitute_details_unchanged():
+    assert substitute_details(POST, PREVIOUS, dict(PREVIOUS)) == POST
+
+
+def test_substitute_details_new_value_not_replaced_again():
+    previous = {**PREVIOUS, "date": "Mar 1", "time": "Mar 2"}
+    current = {**previous, "date": "Mar 2", "time": "Mar 3"}
+    post = "Hi!\n\n• Date: Mar 1\n• Time: Mar 2"
+    assert substitute_details(post, previous, current) == (
+        "Hi!\n\n• Date: Mar 2\n• Time: Mar 3"
+    )
+
+
+def test_index_matches_same_platform_only():
+    index = SimilarityIndex.from_entries([entry(1, platform="twitter")])
+    assert index.best_match(PREVIOUS, Platform.LINKEDIN) is None
+    match = index.best_match(PREVIOUS, Platform.TWITTER)
+    assert match is not None
+    assert match.entry.id == 1
+    assert match.score == 1.0
+
+
+def test_index_prefers_closest_then_newest():
+    other = "A free one day workshop teaching web development with Django to newcomers."
+    index = SimilarityIndex.from_entries(
+        [
+            entry(1, created_at=1.0),
+            entry(2, created_at=2.0),
+            entry(3, created_at=3.0, description=other),
+        ]
+    )
+    match = index.best_match(PREVIOUS, Platform.LINKEDIN)
+    assert match is not None
+    assert match.entry.id == 2
+
+    edited = {**PREVIOUS, "description": DESCRIPTION.replace("pizza", "dim sum")}
+    match = index.best_match(edited, Platform.LINKEDIN)
+    assert match is not None
+    assert 0.5 < match.score < 1.0
+
+
+def test_index_ignores_short_descriptions():
+    index = SimilarityIndex.from_entries([entry(1, description="Python meetup")])
+    assert index.best_match(PREVIOUS, Platform.LINKEDIN) is None
+    assert index.best_match({"description": "Python meetup"}, Platform.LINKEDIN) is None
+
+
+def test_index_add_replaces_entry():
+    index = SimilarityIndex()
+    index.add(entry(1, description="Python meetup with lots of talks and pizza " * 3))
+    index.add(entry(1))
+    match = index.best_match(PREVIOUS, Platform.LINKEDIN)
+    assert match is not None
+    assert match.score == 1.0
@@ -0,0 +1,128 @@
+from postman.prompts import Platform
+from postman.validation import check_format, fix_format
+
+FIELDS = {
+    "title": "PyNight",
+    "date": "Mar 1, 2026",
+    "time": "7:00 PM",
+    "location": "Central",
+    "description": "Monthly meetup",
+}
+
+DETAILS = "• Date: Mar 1, 2026\n• Time: 7:00 PM\n• Location: Central"
+
+
+def test_valid_post_unchanged():
+    post = f"Join us for PyNight!\n\n{DETAILS}\n\n#Python #HKPUG"
+    assert fix_format(post, Platform.LINKEDIN, FIELDS) == (post, [])
+
+
+def test_missing_details_inserted_before_hashtags():
+    post = "Join us for PyNight!\n\n#Python #HKPUG"
+    fixed, problems = fix_format(post, Platform.LINKEDIN, FIELDS)
+    assert fixed == f"Join us for PyNight!\n\n{DETAILS}\n\n#Python #HKPUG"
+    assert problems == []
+
+
+def test_plain_detail_lines_rewritten_in_place():
+    post = (
+        "Join us for PyNight!\n\n"
+        "Date: March 1\nTime: 7 PM\nLocation: Central, HK\n\n"
+        "#Python #HKPUG"
+    )
+    fixed, problems = fix_format(post, Platform.LINKEDIN, FIELDS)
+    assert fixed == (
+        "Join us for PyNight!\n\n"
+        "• Date: March 1\n• Time: 7 PM\n• Location: Central, HK\n\n"
+        "#Python #HKPUG"
+    )
+    assert problems == []
+
+
+def test_decorated_detail_lines_rewritten_in_place():
+    post = (
+        "Join us for PyNight!\n\n"
+        "📅 Date: March 1\n**Time:** 7 PM\n3. Location: Central, HK\n\n"
+        "#Python #HKPUG"
+    )
+    fixed, problems = fix_format(post, Platform.LINKEDIN, FIELDS)
+    assert fixed == (
+        "Join us for PyNight!\n\n"
+        "• Date: March 1\n• Time: 7 PM\n• Location: Central, HK\n\n"
+        "#Python #HKPUG"
+    )
+    assert problems == []
+
+
+def test_decorated_bullets_accepted():
+    post = (
+        "Join us!\n\n"
+        "• 📅 Date: Mar 1, 2026\n• **Time:** 7:00 PM\n- Location: Central\n\n"
+        "#Python #HKPUG"
+    )
+    assert fix_format(post, Platform.LINKEDIN, FIELDS) == (post, [])
+
+
+def test_unrecognized_details_left_for_repair():
+    post = (
+        "Join us!\n\nDate: Mar 1, 2026 | Time: 7:00 PM | Location: Central\n\n"
+        "#Python #HKPUG"
+    )
+    fixed, problems = fix_format(post, Platform.LINKEDIN, FIELDS)
+    assert fixed == post
+    assert problems == ["The event detail bullets are missing: Date, Time, Location."]
+
+    post = "Join us!\n\n📅 Mar 1, 2026 ⏰ 7:00 PM 📍 Central\n\n#Python #HKPUG"
+    fixed, problems = fix_format(post, Platform.TWITTER, FIELDS)
+    assert fixed == post
+    assert problems == ["The event details line '• date | time | location' is missing."]
+
+
+def test_partial_and_misordered_details_completed():
+    post = "Join us!\n\n• Location: Central\nDate: Mar 1, 2026\n\n#Python #HKPUG"
+    fixed, problems = fix_format(post, Platform.LINKEDIN, FIELDS)
+    assert fixed == f"Join us!\n\n{DETAILS}\n\n#Python #HKPUG"
+    assert problems == []
+
+
+def test_details_left_alone_without_form_values():
+    post = "Join us!\n\n#Python #HKPUG"
+    fixed, problems = fix_format(post, Platform.LINKEDIN, {**FIELDS, "time": ""})
+    assert fixed == post
+    assert problems == ["The event detail bullets are missing: Date, Time, Location."]
+
+
+def test_compact_details_replace_labelled_lines():
+    post = "PyNight is back!\n\nDate: Mar 1, 2026\nTime: 7:00 PM\n\n#Python #HKPUG"
+    fixed, problems = fix_format(post, Platform.TWITTER, FIELDS)
+    assert fixed == (
+        "PyNight is back!\n\n• Mar 1, 2026 | 7:00 PM | Central\n\n#Python #HKPUG"
+    )
+    assert problems == []
+
+
+def test_emoji_compact_details_replaced():
+    post = "PyNight is back!\n\n📅 Mar 1 | ⏰ 7 PM | 📍 Central\n\n#Python #HKPUG"
+    fixed, problems = fix_format(post, Platform.TWITTER, FIELDS)
+    assert fixed == (
+        "PyNight is back!\n\n• Mar 1, 2026 | 7:00 PM | Central\n\n#Python #HKPUG"
+    )
+    assert problems == []
+
+
+def test_hashtags_trimmed_and_topped_up():
+    post = f"Join us!\n\n{DETAILS}\n\n#A #B #C #D #E #F #G"
+    fixed, _ = fix_format(post, Platform.LINKEDIN, FIELDS)
+    assert fixed.endswith("\n\n#A #B #C #D #E")
+
+    post = f"Join us!\n\n{DETAILS}"
+    fixed, problems = fix_format(post, Platform.INSTAGRAM, FIELDS)
+    assert fixed.endswith("\n\n#Python #HKPUG #TechCommunity #HongKong #Programming")
+    assert problems == []
+
+
+def test_long_tweet_left_for_repair():
+    post = f"{'Python ' * 40}\n\n• Mar 1 | 7 PM | Central\n\n#Python #HKPUG"
+    fixed, problems = fix_format(post, Platform.TWITTER, FIELDS)
+    assert problems == check_format(fixed, Platform.TWITTER)
+    assert problems[0].startswith("The post is ")